@@ -0,0 +1,22 @@
+"""
+Benchmarks for the slow paths of this library, kept out of the test suite
+because their timings depend on the machine they run on.
+
+Run them all with `make benchmark`, or one at a time with, for example,
+`poetry run python -m benchmarks.parallel_validation`.
+"""
+
+from time import process_time
+
+
+def best_time(function, *, repeat=3, clock=process_time):
+    """
+    The quickest of `repeat` runs of `function`, which is less affected by
+    whatever else the machine is doing than the average.
+    """
+    times = []
+    for _ in range(repeat):
+        start_time = clock()
+        function()
+        times.append(clock() - start_time)
+    return min(times)
@@ -0,0 +1,22 @@
+from benchmarks import (
+    email_validation,
+    formatters,
+    insensitive_dict,
+    parallel_validation,
+    render_many,
+    sanitise_text,
+    template_values,
+)
+
+for benchmark in (
+    parallel_validation,
+    email_validation,
+    render_many,
+    sanitise_text,
+    formatters,
+    template_values,
+    insensitive_dict,
+):
+    print(f"# {benchmark.__name__}")
+    benchmark.main()
+    print()
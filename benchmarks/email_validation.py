@@ -0,0 +1,53 @@
+from random import Random
+from unittest.mock import patch
+
+from benchmarks import best_time
+from notifications_utils import recipients
+from notifications_utils.recipients import (
+    validate_email_address,
+    validate_email_addresses,
+)
+
+
+def main(number_of_addresses=100_000):
+    random = Random(0)
+    common_domains = [
+        "gmail.com",
+        "yahoo.com",
+        "hotmail.com",
+        "outlook.com",
+        "icloud.com",
+        "aol.com",
+        "comcast.net",
+    ]
+    other_domains = [f"agency-{i}.gov" for i in range(3_000)]
+    domains = random.choices(
+        common_domains + other_domains,
+        weights=[30, 15, 10, 10, 8, 3, 3] + [0.01] * len(other_domains),
+        k=number_of_addresses,
+    )
+    email_addresses = [
+        f"firstname.lastname{random.randrange(100_000)}@{domain}" for domain in domains
+    ]
+
+    def validate_each():
+        for email_address in email_addresses:
+            validate_email_address(email_address)
+
+    def validate_in_bulk():
+        recipients._is_valid_hostname.cache_clear()
+        validate_email_addresses(email_addresses)
+
+    with patch.object(
+        recipients, "_is_valid_hostname", recipients._is_valid_hostname.__wrapped__
+    ):
+        uncached_time = best_time(validate_each)
+    bulk_time = best_time(validate_in_bulk)
+
+    print(f"Validating {number_of_addresses:,} email addresses")
+    print(f"  one at a time, without caching hostnames: {uncached_time:.2f}s")
+    print(f"  in bulk: {bulk_time:.2f}s ({uncached_time / bulk_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
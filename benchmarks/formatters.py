@@ -0,0 +1,85 @@
+from functools import partial
+
+from benchmarks import best_time
+from notifications_utils.formatters import (
+    autolink_urls,
+    make_quotes_smart,
+    normalise_multiple_newlines,
+    remove_smart_quotes_from_email_addresses,
+    remove_whitespace_before_punctuation,
+    replace_hyphens_with_en_dashes,
+    unlink_govuk_escaped,
+)
+
+messages = (
+    "Your appointment is on Tuesday 12 March at 10:30am. Reply STOP to cancel",
+    "Your security code is 123456",
+    "Hi, your parcel will arrive today between 1pm and 3pm",
+    "Reminder: your passport expires on 1 May 2025. Renew online at "
+    "https://www.example.gov/renew",
+    "Hello Jo Bloggs\n\n"
+    "Your application has been received and we will contact you within 10 "
+    "working days.\n\n"
+    "Thanks\n"
+    "The licensing team",
+    "Dear Sam,\n\n"
+    "We’ve received your payment of $120.00 for your renewal. You don’t need "
+    "to do anything else.\n\n"
+    "If you have any questions, reply to this email.",
+    "Hi Alex,\n\n"
+    'Your "Blue Badge" renewal - reference 1234 - has been approved. '
+    "We'll post it to you within 5 working days.",
+)
+
+# Content which would take quadratic time to autolink if every position
+# in a long run of words were tried as the start of a URL
+pathological_content = (
+    "a-",  # a long tracking string
+    "a-b.",  # a long tracking string with dots
+    "QUJD+REVG/R0g=-",  # pasted base64
+    "xhttp://a-",
+)
+
+
+def format_messages(formatter, times=200):
+    for _ in range(times):
+        for message in messages:
+            formatter(message)
+
+
+def main():
+    print(f"Formatting {len(messages)} realistic messages 200 times")
+    for formatter in (
+        autolink_urls,
+        make_quotes_smart,
+        normalise_multiple_newlines,
+        remove_smart_quotes_from_email_addresses,
+        remove_whitespace_before_punctuation,
+        replace_hyphens_with_en_dashes,
+        unlink_govuk_escaped,
+    ):
+        time_without_triggers = best_time(
+            partial(format_messages, formatter.__wrapped__)
+        )
+        time_with_triggers = best_time(partial(format_messages, formatter))
+        print(
+            f"  {formatter.__name__}: {time_without_triggers * 1000:.2f}ms "
+            f"without triggers, {time_with_triggers * 1000:.2f}ms with triggers"
+        )
+
+    print()
+    print("Autolinking pathological content")
+    for repeated in pathological_content:
+        print(f"  {repeated!r} repeated:")
+        for length in (20_000, 80_000, 320_000):
+            # The full stop at the end means the content has to be searched
+            content = repeated * (length // len(repeated)) + "."
+            time = best_time(partial(autolink_urls, content))
+            print(
+                f"    {length:,} characters: {time * 1000:.1f}ms "
+                f"({time / length * 1_000_000_000:.0f}ns per character)"
+            )
+
+
+if __name__ == "__main__":
+    main()
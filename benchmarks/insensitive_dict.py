@@ -0,0 +1,87 @@
+from functools import lru_cache, partial
+
+from ordered_set import OrderedSet
+
+from benchmarks import best_time
+from notifications_utils.insensitive_dict import InsensitiveDict
+
+
+class _UncachedInsensitiveDict(dict):
+    # How `InsensitiveDict` used to work, to compare against
+    def __init__(self, row_dict):
+        for key, value in row_dict.items():
+            self[key] = value
+
+    def keys(self):
+        return OrderedSet(super().keys())
+
+    def __getitem__(self, key):
+        return super().__getitem__(self.make_key(key))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(self.make_key(key), value)
+
+    def __contains__(self, key):
+        return super().__contains__(self.make_key(key))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    @staticmethod
+    @lru_cache(maxsize=32, typed=False)
+    def make_key(original_key):
+        if original_key is None:
+            return None
+        return original_key.translate(InsensitiveDict.KEY_TRANSLATION_TABLE).lower()
+
+
+_columns = [f"Column {index}" for index in range(50)]
+_row = {column: "value" for column in _columns}
+
+
+def _look_up_row_cells(dict_class):
+    # Like `Row`, which normalises every column name of every row
+    for _ in range(1_000):
+        for column in _columns:
+            dict_class.make_key(column)
+
+
+def _build_field_values(dict_class):
+    # Like `Field.values`, which builds a dictionary from the
+    # personalisation and then gets each placeholder from it
+    for _ in range(1_000):
+        values = dict_class(_row)
+        for column in _columns:
+            values.get(column)
+
+
+def _bind_template_values(dict_class):
+    # Like `Template.values`, which normalises the personalisation and
+    # placeholders, then asks for the keys again each time it’s compared
+    # to another template
+    values = dict_class(_row)
+    for _ in range(1_000):
+        for column in _columns:
+            dict_class.make_key(column)
+        values.keys()
+
+
+def main():
+    print("InsensitiveDict access patterns, for a row with 50 columns")
+    for access_pattern in (
+        _look_up_row_cells,
+        _build_field_values,
+        _bind_template_values,
+    ):
+        uncached_time = best_time(partial(access_pattern, _UncachedInsensitiveDict))
+        cached_time = best_time(partial(access_pattern, InsensitiveDict))
+        print(f"  {access_pattern.__name__.strip('_').replace('_', ' ')}")
+        print(f"    before caching: {uncached_time * 1000:.1f}ms")
+        print(
+            f"    now: {cached_time * 1000:.1f}ms "
+            f"({uncached_time / cached_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
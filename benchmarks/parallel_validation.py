@@ -0,0 +1,40 @@
+import os
+from functools import partial
+from time import perf_counter
+
+from benchmarks import best_time
+from notifications_utils.recipients import RecipientCSV
+from notifications_utils.template import SMSMessageTemplate
+
+
+def main(number_of_rows=20_000):
+    recipients = RecipientCSV(
+        "phone number,name\n"
+        + "".join(f"20255501{i % 100:02},Name {i}\n" for i in range(number_of_rows)),
+        template=SMSMessageTemplate(
+            {"content": "hello ((name))", "template_type": "sms"}
+        ),
+    )
+
+    # Wall clock time, because the work is done in other processes
+    serial_time = best_time(lambda: list(recipients.get_rows()), clock=perf_counter)
+    print(f"Validating {number_of_rows:,} rows")
+    print(f"  serially: {serial_time:.2f}s")
+
+    for max_workers in range(1, (os.cpu_count() or 1) + 1):
+        parallel_time = best_time(
+            partial(_get_rows_in_parallel, recipients, max_workers),
+            clock=perf_counter,
+        )
+        print(
+            f"  {max_workers} workers: {parallel_time:.2f}s "
+            f"({serial_time / parallel_time:.2f}x)"
+        )
+
+
+def _get_rows_in_parallel(recipients, max_workers):
+    return list(recipients.get_rows_in_parallel(max_workers=max_workers))
+
+
+if __name__ == "__main__":
+    main()
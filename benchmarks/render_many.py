@@ -0,0 +1,66 @@
+from functools import partial
+
+from benchmarks import best_time
+from notifications_utils.template import (
+    HTMLEmailTemplate,
+    SMSMessageTemplate,
+    render_many,
+)
+
+template_content = (
+    "Dear ((name)),\n\n"
+    "Your ((clinic)) appointment is on ((date)) at ((time)).\n\n"
+    "* Bring your letter\n"
+    "* Arrive 10 minutes early\n\n"
+    "Reply STOP to cancel. See https://www.example.com/appointments"
+)
+
+
+def main(number_of_recipients=5_000):
+    print(f"Rendering a template for {number_of_recipients:,} recipients")
+    for template_class in (SMSMessageTemplate, HTMLEmailTemplate):
+        template = {
+            "template_type": template_class.template_type,
+            "subject": "Your appointment",
+            "content": template_content,
+        }
+        for description, name in (
+            ("a different name each", "Person {}"),
+            ("the same name", "Person"),
+        ):
+            personalisations = [
+                {
+                    "name": name.format(index),
+                    "clinic": ("North", "South", "East")[index % 3],
+                    "date": "Monday",
+                    "time": f"{9 + index % 8}:00",
+                }
+                for index in range(number_of_recipients)
+            ]
+            per_template_time = best_time(
+                partial(_render_each, template_class, template, personalisations)
+            )
+            render_many_time = best_time(
+                partial(_render_many, template, personalisations)
+            )
+            print(f"  {template_class.__name__}, {description}")
+            print(f"    a template per recipient: {per_template_time:.2f}s")
+            print(
+                f"    render_many: {render_many_time:.2f}s "
+                f"({per_template_time / render_many_time:.2f}x)"
+            )
+
+
+def _render_each(template_class, template, personalisations):
+    return [
+        str(template_class(template, personalisation))
+        for personalisation in personalisations
+    ]
+
+
+def _render_many(template, personalisations):
+    return list(render_many(template, personalisations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+from benchmarks import best_time
+from notifications_utils.sanitise_text import SanitiseSMS
+
+content = (
+    "Mae’r apwyntiad ŵyr yn ddydd Llun… 🐮🔔 "
+    "这是一条很长的消息 これはテストです “Это длинное” – Łōdź\t"
+) * 200
+
+
+def main():
+    each_character_time = best_time(
+        lambda: "".join(map(SanitiseSMS.encode_char, content))
+    )
+    encode_time = best_time(lambda: SanitiseSMS.encode(content))
+
+    print(f"Encoding {len(content):,} characters of mixed text for SMS")
+    print(f"  a character at a time: {each_character_time * 1000:.2f}ms")
+    print(
+        f"  with SanitiseSMS.encode: {encode_time * 1000:.2f}ms "
+        f"({each_character_time / encode_time:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from benchmarks import best_time
+from notifications_utils.insensitive_dict import InsensitiveDict
+from notifications_utils.template import SMSMessageTemplate, Template
+
+
+def _bind_values_by_finding_placeholders(template, value):
+    # How values were bound before the placeholders were worked out once
+    placeholders = InsensitiveDict.from_keys(template.placeholders)
+    template._values = InsensitiveDict(value).as_dict_with_keys(
+        template.placeholders
+        | set(
+            key
+            for key in value.keys()
+            if InsensitiveDict.make_key(key) not in placeholders.keys()
+        )
+    )
+
+
+def main(number_of_rows=5_000):
+    template = SMSMessageTemplate(
+        {
+            "template_type": "sms",
+            "content": "".join(f"((column {index})) " for index in range(10)),
+        }
+    )
+    rows = [
+        {
+            "phone number": "2025550100",
+            **{f"column {index}": f"value {row} {index}" for index in range(10)},
+        }
+        for row in range(number_of_rows)
+    ]
+
+    def bind_rows():
+        # Every `Row` binds its values to the template like this
+        for row in rows:
+            template.values = row
+
+    binding_time = best_time(bind_rows)
+    with patch.object(
+        Template,
+        "values",
+        property(Template.values.fget, _bind_values_by_finding_placeholders),
+    ):
+        finding_placeholders_time = best_time(bind_rows)
+
+    print(f"Binding {number_of_rows:,} rows to a template with 10 placeholders")
+    print(f"  finding placeholders for each row: {finding_placeholders_time:.2f}s")
+    print(
+        f"  with placeholders found once: {binding_time:.2f}s "
+        f"({finding_placeholders_time / binding_time:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
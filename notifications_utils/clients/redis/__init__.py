@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from .render_cache import RedisRenderCache  # noqa: F401 (unused import)
 from .request_cache import RequestCache  # noqa: F401 (unused import)
 
 
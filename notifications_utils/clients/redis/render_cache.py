@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from notifications_utils.render_cache import RenderCache
+
+
+class RedisRenderCache(RenderCache):
+    """
+    Keeps rendered templates in Redis, so they can be shared between
+    processes. Each one expires after `ttl_in_seconds`.
+    """
+
+    DEFAULT_TTL = int(timedelta(days=1).total_seconds())
+
+    def __init__(self, redis_client, *, ttl_in_seconds=DEFAULT_TTL):
+        super().__init__()
+        self.redis_client = redis_client
+        self.ttl_in_seconds = ttl_in_seconds
+
+    def get(self, key):
+        cached = self.redis_client.get(key)
+        if cached is None:
+            return None
+        return cached.decode("utf-8")
+
+    def set(self, key, rendered):
+        self.redis_client.set(key, str(rendered), ex=int(self.ttl_in_seconds))
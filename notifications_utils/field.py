@@ -1,4 +1,6 @@
 import re
+from collections import namedtuple
+from functools import lru_cache
 
 from markupsafe import Markup
 from ordered_set import OrderedSet
@@ -48,6 +50,53 @@ class Placeholder:
         return "Placeholder({})".format(self.body)
 
 
+class CompiledPlaceholder(
+    namedtuple("CompiledPlaceholder", ["name", "conditional_text", "key"])
+):
+    """
+    A `Placeholder` with everything needed to render it worked out up front.
+    `conditional_text` is `None` for placeholders which aren’t conditional,
+    and `key` is the name normalised the same way as an `InsensitiveDict`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_match(cls, match):
+        placeholder = Placeholder.from_match(match)
+        return cls(
+            name=placeholder.name,
+            conditional_text=(
+                placeholder.conditional_text if placeholder.is_conditional() else None
+            ),
+            key=InsensitiveDict.make_key(placeholder.name),
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_content(content, placeholder_pattern, sanitizer):
+    """
+    Sanitises `content` and splits it into a tuple of literal strings and
+    `CompiledPlaceholder`s, so that rendering it is a join over the tuple
+    rather than a regular expression substitution.
+    """
+    content = sanitizer(content)
+    compiled = []
+    position = 0
+
+    for match in placeholder_pattern.finditer(content):
+        start = match.start()
+        if start > position:
+            compiled.append(str(content[position:start]))
+        compiled.append(CompiledPlaceholder.from_match(match))
+        position = match.end()
+
+    if position < len(content):
+        compiled.append(str(content[position:]))
+
+    return tuple(compiled)
+
+
 class Field:
     """
     An instance of Field represents a string of text which may contain
@@ -116,12 +165,13 @@ class Field:
         self._values = InsensitiveDict(value) if value else {}
 
     def format_match(self, match):
-        placeholder = Placeholder.from_match(match)
+        return self._format_placeholder(CompiledPlaceholder.from_match(match))
 
+    def _format_placeholder(self, placeholder):
         if self.redact_missing_personalisation:
             return self.placeholder_tag_redacted
 
-        if placeholder.is_conditional():
+        if placeholder.conditional_text is not None:
             return self.conditional_placeholder_tag.format(
                 placeholder.name, placeholder.conditional_text
             )
@@ -129,23 +179,28 @@ class Field:
         return self.placeholder_tag.format(placeholder.name)
 
     def replace_match(self, match):
-        placeholder = Placeholder.from_match(match)
-        replacement = self.values.get(placeholder.name)
+        return self._replace_placeholder(CompiledPlaceholder.from_match(match))
+
+    def _replace_placeholder(self, placeholder):
+        # Values are always an `InsensitiveDict` (or empty) so the key is
+        # already normalised
+        replacement = dict.get(self.values, placeholder.key)
 
-        if placeholder.is_conditional() and replacement is not None:
-            return placeholder.get_conditional_body(replacement)
+        if placeholder.conditional_text is not None and replacement is not None:
+            return placeholder.conditional_text if str2bool(replacement) else ""
 
-        replaced_value = self.get_replacement(placeholder)
-        if replaced_value is not None:
-            return self.get_replacement(placeholder)
+        if replacement is not None:
+            return self._format_replacement(replacement)
 
-        return self.format_match(match)
+        return self._format_placeholder(placeholder)
 
     def get_replacement(self, placeholder):
         replacement = self.values.get(placeholder.name)
         if replacement is None:
             return None
+        return self._format_replacement(replacement)
 
+    def _format_replacement(self, replacement):
         if isinstance(replacement, list):
             vals = (
                 strip_and_remove_obscure_whitespace(str(val))
@@ -164,10 +219,15 @@ class Field:
             return "\n\n" + "\n".join("* {}".format(item) for item in replacement)
         return unescaped_formatted_list(replacement, before_each="", after_each="")
 
+    @property
+    def _compiled_content(self):
+        return compile_content(self.content, self.placeholder_pattern, self.sanitizer)
+
     @property
     def _raw_formatted(self):
-        return re.sub(
-            self.placeholder_pattern, self.format_match, self.sanitizer(self.content)
+        return "".join(
+            part if isinstance(part, str) else self._format_placeholder(part)
+            for part in self._compiled_content
         )
 
     @property
@@ -185,8 +245,9 @@ class Field:
 
     @property
     def replaced(self):
-        return re.sub(
-            self.placeholder_pattern, self.replace_match, self.sanitizer(self.content)
+        return "".join(
+            part if isinstance(part, str) else self._replace_placeholder(part)
+            for part in self._compiled_content
         )
 
 
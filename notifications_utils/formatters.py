@@ -7,6 +7,7 @@ import bleach
 import smartypants
 from markupsafe import Markup
 
+from notifications_utils.pipeline import substitutes, triggered_by
 from notifications_utils.sanitise_text import SanitiseSMS
 
 from . import email_with_smart_quotes_regex
@@ -26,6 +27,11 @@ ALL_WHITESPACE = (
     string.whitespace + OBSCURE_ZERO_WIDTH_WHITESPACE + OBSCURE_FULL_WIDTH_WHITESPACE
 )
 
+obscure_whitespace_translation = str.maketrans(
+    dict.fromkeys(OBSCURE_FULL_WIDTH_WHITESPACE, " ")
+    | dict.fromkeys(OBSCURE_ZERO_WIDTH_WHITESPACE)
+)
+
 govuk_not_a_link = re.compile(r"(^|\s)(#|\*|\^)?(GOV)\.(UK)(?!\/|\?|#)", re.IGNORECASE)
 
 smartypants.tags_to_skip = smartypants.tags_to_skip + ["a"]
@@ -55,9 +61,17 @@ url = re.compile(
     r"([/\?#][^<\s]*)?"  # start of path, query or fragment
 )
 
+# Where a match for `url` could start, judging only by the characters
+# around that position
+url_candidate = re.compile(r"\b(?<![\@\.])(?:(?i:https?://)|[\w\-])")
+url_scheme = re.compile(r"(?i)https?://")
+# Words joined by single dots, like a domain name
+dotted_words = re.compile(r"[\w\-]+(?:\.[\w\-]+)*")
+
 more_than_two_newlines_in_a_row = re.compile(r"\n{3,}")
 
 
+@triggered_by("ov.", "oV.", "Ov.", "OV.")
 def unlink_govuk_escaped(message):
     return re.sub(
         govuk_not_a_link,
@@ -115,16 +129,45 @@ def make_link_from_url(linked_part, *, classes=""):
     return f"{create_sanitised_html_for_url(linked_part, classes=classes)}{trailing_characters}"
 
 
+def find_urls(value):
+    """
+    Finds the same matches as `url.finditer(value)`, but in time
+    proportional to the length of `value`.
+
+    Trying `url` at every position means going over a long run of words
+    once for each position in it. This only tries it at the first
+    position it could match in each run of words joined by dots. If there
+    isn’t a match there, then there can’t be one starting anywhere else
+    in those words either, because the rest of the match would have to be
+    made of the same words. The exception is a scheme, like `https://`,
+    at the end of them.
+    """
+    position = 0
+    while candidate := url_candidate.search(value, position):
+        start = candidate.start()
+        if match := url.match(value, start):
+            yield match
+            position = match.end()
+            continue
+        end = dotted_words.match(value, start).end()
+        if scheme := url_scheme.search(value, start + 1, end + len("://")):
+            position = scheme.start()
+        else:
+            position = max(end, start + 1)
+
+
+@triggered_by(".", unchanged=Markup)
 def autolink_urls(value, *, classes=""):
-    return Markup(
-        url.sub(
-            lambda match: make_link_from_url(
-                match.group(0),
-                classes=classes,
-            ),
-            value,
+    linked, end = [], 0
+    for match in find_urls(value):
+        start = match.start()
+        linked += (
+            value[end:start],
+            make_link_from_url(match.group(0), classes=classes),
         )
-    )
+        end = match.end()
+    linked.append(value[end:])
+    return Markup("".join(linked))
 
 
 def create_sanitised_html_for_url(link, *, classes="", style=""):
@@ -248,14 +291,18 @@ def formatted_list(
     )
 
 
+@triggered_by(" ,", "\t,", " .", "\t.")
+@substitutes(whitespace_before_punctuation, r"\1", characters=" \t,.")
 def remove_whitespace_before_punctuation(value):
     return re.sub(whitespace_before_punctuation, lambda match: match.group(1), value)
 
 
+@triggered_by("'", '"', "\\", "&")
 def make_quotes_smart(value):
     return smartypants.smartypants(value, smartypants.Attr.q | smartypants.Attr.u)
 
 
+@triggered_by("-", "–", "—")
 def replace_hyphens_with_en_dashes(value):
     return re.sub(
         hyphens_surrounded_by_spaces,
@@ -293,10 +340,37 @@ def normalise_whitespace(value):
     return " ".join(value.split())
 
 
+@triggered_by("\n\n\n")
+@substitutes(more_than_two_newlines_in_a_row, "\n\n", characters="\n")
 def normalise_multiple_newlines(value):
     return more_than_two_newlines_in_a_row.sub("\n\n", value)
 
 
+def normalise_sms(value, prefix=None):
+    """
+    Does the same as `add_prefix`, `remove_whitespace_before_punctuation`,
+    `normalise_whitespace_and_newlines`, `normalise_multiple_newlines` and
+    `str.strip` one after the other, but goes over the message once rather
+    than building a new string for each step.
+    """
+    lines = []
+    previous_line_blank = True
+    value = whitespace_before_punctuation.sub(r"\1", add_prefix(value, prefix))
+    for line in value.splitlines():
+        # Obscure whitespace characters are never ASCII
+        if not line.isascii():
+            line = line.translate(obscure_whitespace_translation)
+        line = " ".join(line.split())
+        # Blank lines at the start are stripped, and more than one in a
+        # row become a single blank line
+        if line or not previous_line_blank:
+            lines.append(line)
+        previous_line_blank = not line
+    if lines and previous_line_blank:
+        lines.pop()
+    return "\n".join(lines)
+
+
 def strip_leading_whitespace(value):
     return value.lstrip()
 
@@ -305,6 +379,7 @@ def add_trailing_newline(value):
     return "{}\n".format(value)
 
 
+@triggered_by("@")
 def remove_smart_quotes_from_email_addresses(value):
     def remove_smart_quotes(match):
         value = match.group(0)
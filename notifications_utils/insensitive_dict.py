@@ -1,7 +1,13 @@
-from functools import lru_cache
+from sys import intern
 
 from ordered_set import OrderedSet
 
+# Every key normalised by `InsensitiveDict.make_key`, shared by the whole
+# process so that the same column names or placeholders seen on every row
+# of a spreadsheet are only normalised once
+_normalised_keys = {}
+_max_normalised_keys = 10_000
+
 
 class InsensitiveDict(dict):
     """
@@ -13,11 +19,19 @@ class InsensitiveDict(dict):
     >>> True
     """
 
+    __slots__ = ("_keys",)
+
     KEY_TRANSLATION_TABLE = {ord(c): None for c in " _-"}
 
     def __init__(self, row_dict):
-        for key, value in row_dict.items():
-            self[key] = value
+        self._keys = None
+        if type(row_dict) is type(self):
+            # Its keys are already normalised
+            super().__init__(row_dict)
+        else:
+            super().__init__(
+                (self.make_key(key), value) for key, value in row_dict.items()
+            )
 
     @classmethod
     def from_keys(cls, keys):
@@ -30,30 +44,88 @@ class InsensitiveDict(dict):
         """
         return cls({key: key for key in keys})
 
+    @classmethod
+    def from_normalised_keys(cls, row_dict):
+        """
+        Like `InsensitiveDict(row_dict)`, but trusts that the keys of
+        `row_dict` have already been through `make_key`.
+        """
+        instance = cls.__new__(cls)
+        instance._keys = None
+        dict.__init__(instance, row_dict)
+        return instance
+
     def keys(self):
-        return OrderedSet(super().keys())
+        """
+        The keys are kept until the dictionary next changes, so treat them
+        as read only.
+        """
+        try:
+            if self._keys is not None:
+                return self._keys
+        except AttributeError:
+            pass
+        self._keys = OrderedSet(super().keys())
+        return self._keys
 
     def __getitem__(self, key):
         return super().__getitem__(self.make_key(key))
 
     def __setitem__(self, key, value):
+        self._keys = None
         super().__setitem__(self.make_key(key), value)
 
+    def __delitem__(self, key):
+        self._keys = None
+        super().__delitem__(key)
+
     def __contains__(self, key):
         return super().__contains__(self.make_key(key))
 
+    def __ior__(self, other):
+        self._keys = None
+        return super().__ior__(other)
+
     def get(self, key, default=None):
-        return self[key] if key in self else default
+        return super().get(self.make_key(key), default)
+
+    def pop(self, *args):
+        self._keys = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._keys = None
+        return super().popitem()
+
+    def setdefault(self, *args):
+        self._keys = None
+        return super().setdefault(*args)
+
+    def update(self, *args, **kwargs):
+        self._keys = None
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self._keys = None
+        super().clear()
 
     def copy(self):
-        return self.__class__(super().copy())
+        return self.from_normalised_keys(self)
 
     def as_dict_with_keys(self, keys):
         return {key: self.get(key) for key in keys}
 
     @staticmethod
-    @lru_cache(maxsize=32, typed=False)
     def make_key(original_key):
         if original_key is None:
             return None
-        return original_key.translate(InsensitiveDict.KEY_TRANSLATION_TABLE).lower()
+        try:
+            return _normalised_keys[original_key]
+        except KeyError:
+            pass
+        if len(_normalised_keys) >= _max_normalised_keys:
+            _normalised_keys.clear()
+        normalised = _normalised_keys[original_key] = intern(
+            original_key.translate(InsensitiveDict.KEY_TRANSLATION_TABLE).lower()
+        )
+        return normalised
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from itertools import count
 
 import mistune
@@ -288,21 +289,51 @@ class NotifyEmailPreheaderMarkdownRenderer(NotifyPlainTextEmailMarkdownRenderer)
         )
 
 
+class CachedBlockLexer(mistune.BlockLexer):
+    """
+    Remembers the block tokens for text it has already lexed. All our
+    renderers share the same block grammar, so rendering an email’s HTML
+    body, plain text and preheader from the same text only lexes it once.
+    """
+
+    def __call__(self, text, rules=None):
+        if rules is not None:
+            return super().__call__(text, rules)
+
+        tokens, def_links, def_footnotes = _lex_blocks(text)
+        # The renderers pop tokens and number footnotes as they go, so
+        # each render gets its own copies
+        self.tokens = list(tokens)
+        self.def_links = dict(def_links)
+        self.def_footnotes = dict(def_footnotes)
+        return self.tokens
+
+
+@lru_cache(maxsize=256)
+def _lex_blocks(text):
+    lexer = mistune.BlockLexer(mistune.BlockGrammar())
+    return tuple(lexer(text)), lexer.def_links, lexer.def_footnotes
+
+
 notify_email_markdown = mistune.Markdown(
     renderer=NotifyEmailMarkdownRenderer(),
+    block=CachedBlockLexer(),
     hard_wrap=True,
     use_xhtml=False,
 )
 notify_plain_text_email_markdown = mistune.Markdown(
     renderer=NotifyPlainTextEmailMarkdownRenderer(),
+    block=CachedBlockLexer(),
     hard_wrap=True,
 )
 notify_email_preheader_markdown = mistune.Markdown(
     renderer=NotifyEmailPreheaderMarkdownRenderer(),
+    block=CachedBlockLexer(),
     hard_wrap=True,
 )
 notify_letter_preview_markdown = mistune.Markdown(
     renderer=NotifyLetterMarkdownPreviewRenderer(),
+    block=CachedBlockLexer(),
     hard_wrap=True,
     use_xhtml=False,
 )
@@ -0,0 +1,233 @@
+import re
+from collections import Counter, namedtuple
+from functools import wraps
+from time import perf_counter
+
+# What we know about formatters beyond being callable. Anything not in
+# here (including a formatter which has been mocked out) is treated as a
+# plain function which is always run.
+#
+# These, and the compiled stages, are keyed by `id` rather than by the
+# formatters themselves, so that looking them up doesn’t hash (and so
+# call) any mocks. Each entry keeps a reference to the formatters it’s
+# keyed by, so the `id`s can’t be reused while it’s in here.
+_stage_details = {}
+_compiled_stages = {}
+_max_compiled_stages = 256
+
+_scopable_flags = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+
+class Substitution(
+    namedtuple("Substitution", ("pattern", "replacement", "characters"))
+):
+    """
+    Describes a formatter which does nothing but `pattern.sub(replacement, value)`.
+
+    `characters` must include every character a match can contain or look
+    at, and every character the replacement can contain. The replacement
+    must never be empty, and `pattern` must not use backreferences.
+    Neighbouring substitutions whose `characters` don’t overlap can’t
+    affect each other, so a `Pipeline` can do them in one pass.
+    """
+
+    __slots__ = ()
+
+    def replace(self, match):
+        own_match = self.pattern.match(match.string, match.start())
+        if callable(self.replacement):
+            return self.replacement(own_match)
+        return own_match.expand(self.replacement)
+
+    @property
+    def scoped_pattern(self):
+        flags = "".join(
+            letter for flag, letter in _scopable_flags if self.pattern.flags & flag
+        )
+        return f"(?{flags}:{self.pattern.pattern})" if flags else self.pattern.pattern
+
+
+def triggered_by(*triggers, unchanged=str):
+    """
+    Declares that a formatter never changes text which doesn’t contain at
+    least one of `triggers`. The formatter then returns that text straight
+    away, passed through `unchanged` so that it’s the same type as the
+    formatter would have returned, rather than scanning it. A `Pipeline`
+    skips it altogether.
+
+    The triggers are available as `formatter.triggers`.
+    """
+    trigger = _trigger_for(triggers)
+
+    def decorator(formatter):
+        @wraps(formatter)
+        def formatter_with_trigger(value, *args, **kwargs):
+            if trigger(value):
+                return formatter(value, *args, **kwargs)
+            return unchanged(value)
+
+        formatter_with_trigger.triggers = frozenset(triggers)
+        # A `Pipeline` checks the trigger itself, so can go straight to
+        # the original formatter
+        _set_stage(
+            formatter_with_trigger, _get_stage(formatter)._replace(trigger=trigger)
+        )
+        return formatter_with_trigger
+
+    return decorator
+
+
+def substitutes(pattern, replacement, *, characters):
+    """
+    Marks a formatter as a single regular expression substitution, so a
+    `Pipeline` can combine it with its neighbours. See `Substitution`.
+    """
+
+    def decorator(formatter):
+        _set_stage(
+            formatter,
+            _get_stage(formatter)._replace(
+                substitutions=(
+                    Substitution(pattern, replacement, frozenset(characters)),
+                )
+            ),
+        )
+        return formatter
+
+    return decorator
+
+
+class _Stage(namedtuple("_Stage", ("formatter", "trigger", "substitutions"))):
+    __slots__ = ()
+
+    def __new__(cls, formatter, trigger=None, substitutions=()):
+        return super().__new__(cls, formatter, trigger, substitutions)
+
+    @property
+    def name(self):
+        return getattr(self.formatter, "__name__", repr(self.formatter))
+
+    @property
+    def characters(self):
+        return frozenset().union(
+            *(substitution.characters for substitution in self.substitutions)
+        )
+
+    def can_merge_with(self, other):
+        return (
+            self.substitutions
+            and other.substitutions
+            and self.characters.isdisjoint(other.characters)
+        )
+
+    def merge_with(self, other):
+        substitutions = self.substitutions + other.substitutions
+        combined = re.compile(
+            "|".join(
+                f"({substitution.scoped_pattern})" for substitution in substitutions
+            )
+        )
+        # The number of the group which wraps each substitution
+        group_numbers, group_number = [], 1
+        for substitution in substitutions:
+            group_numbers.append(group_number)
+            group_number += substitution.pattern.groups + 1
+
+        def replace(match):
+            for number, substitution in zip(group_numbers, substitutions):
+                if match.group(number) is not None:
+                    return substitution.replace(match)
+
+        def formatter(value):
+            return combined.sub(replace, value)
+
+        formatter.__name__ = f"{self.name}+{other.name}"
+
+        return _Stage(
+            formatter,
+            trigger=_either_trigger(self.trigger, other.trigger),
+            substitutions=substitutions,
+        )
+
+
+class Pipeline:
+    """
+    Runs text through each of `stages` in turn, like chaining
+    `Take(value).then(…).then(…)`, but:
+    - formatters marked with `triggered_by` are skipped if the text doesn’t
+      contain anything which would make them do something
+    - neighbouring formatters marked with `substitutes` are done in a
+      single pass, if they can’t affect each other
+
+    Working out how to run the stages is only done once for each
+    combination of stages.
+
+    Set `Pipeline.profiling = True` to add up the time spent in each stage
+    in `Pipeline.timings`.
+    """
+
+    profiling = False
+    timings = Counter()
+
+    def __init__(self, *stages):
+        self.stages = _compile_stages(stages)
+
+    def __call__(self, value):
+        value = str(value)
+        for stage in self.stages:
+            if stage.trigger is not None and not stage.trigger(value):
+                continue
+            if self.profiling:
+                start_time = perf_counter()
+                value = str(stage.formatter(value))
+                Pipeline.timings[stage.name] += perf_counter() - start_time
+            else:
+                value = str(stage.formatter(value))
+        return value
+
+
+def _compile_stages(formatters):
+    key = tuple(map(id, formatters))
+    try:
+        return _compiled_stages[key][1]
+    except KeyError:
+        pass
+    stages = []
+    for formatter in formatters:
+        stage = _get_stage(formatter)
+        if stages and stages[-1].can_merge_with(stage):
+            stage = stages.pop().merge_with(stage)
+        stages.append(stage)
+    if len(_compiled_stages) >= _max_compiled_stages:
+        _compiled_stages.clear()
+    _compiled_stages[key] = formatters, tuple(stages)
+    return _compiled_stages[key][1]
+
+
+def _get_stage(formatter):
+    try:
+        return _stage_details[id(formatter)][1]
+    except KeyError:
+        return _Stage(formatter)
+
+
+def _set_stage(formatter, stage):
+    _stage_details[id(formatter)] = formatter, stage
+
+
+def _trigger_for(triggers):
+    if len(triggers) == 1:
+        (trigger,) = triggers
+        return lambda value: trigger in value
+    return re.compile("|".join(map(re.escape, triggers))).search
+
+
+def _either_trigger(first, second):
+    if first is None or second is None:
+        return None
+    return lambda value: first(value) or second(value)
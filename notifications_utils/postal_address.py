@@ -39,10 +39,11 @@ class PostalAddress:
             if line.rstrip(" ,")
         ] or [""]
 
-        try:
-            self.country = Country(self._lines[-1])
+        country = _country_or_none(self._lines[-1])
+        if country:
+            self.country = country
             self._lines_without_country = self._lines[:-1]
-        except CountryNotFoundError:
+        else:
             self._lines_without_country = self._lines
             self.country = country_UK
 
@@ -56,14 +57,18 @@ class PostalAddress:
     def from_personalisation(
         cls, personalisation_dict, allow_international_letters=False
     ):
+        return cls(
+            cls.raw_address_from_personalisation(personalisation_dict),
+            allow_international_letters=allow_international_letters,
+        )
+
+    @staticmethod
+    def raw_address_from_personalisation(personalisation_dict):
         if address_line_7_key in personalisation_dict:
             keys = address_lines_1_to_6_keys + [address_line_7_key]
         else:
             keys = address_lines_1_to_6_and_postcode_keys
-        return cls(
-            "\n".join(str(personalisation_dict.get(key) or "") for key in keys),
-            allow_international_letters=allow_international_letters,
-        )
+        return "\n".join(str(personalisation_dict.get(key) or "") for key in keys)
 
     @property
     def as_personalisation(self):
@@ -135,7 +140,7 @@ class PostalAddress:
 
     @property
     def postcode(self):
-        if self.international:
+        if self.international or not self._lines_without_country:
             return None
         return format_postcode_or_none(self._lines_without_country[-1])
 
@@ -149,17 +154,49 @@ class PostalAddress:
         )
 
 
+def validate_postal_addresses(raw_addresses, allow_international_letters=False):
+    """
+    Validates lots of addresses at once, for example the address columns of
+    a spreadsheet. Returns a list with, for each of `raw_addresses` in order,
+    whether `PostalAddress(raw_address).valid` is true.
+
+    Each distinct address is only parsed once. Looking up countries and
+    postcodes is cached, because most addresses in a file share a few of
+    them.
+    """
+    raw_addresses = list(raw_addresses)
+    results = {}
+    for raw_address in raw_addresses:
+        if raw_address not in results:
+            results[raw_address] = PostalAddress(
+                raw_address, allow_international_letters=allow_international_letters
+            ).valid
+    return [results[raw_address] for raw_address in raw_addresses]
+
+
+@lru_cache(maxsize=1024)
+def _country_or_none(line):
+    try:
+        return Country(line)
+    except CountryNotFoundError:
+        return None
+
+
 def normalise_postcode(postcode):
     return remove_whitespace(postcode).upper()
 
 
-def is_a_real_uk_postcode(postcode):
-    standard = r"([A-Z]{1,2}[0-9][0-9A-Z]?[0-9][A-BD-HJLNP-UW-Z]{2})"
-    bfpo = r"(BFPO?(C\/O)?[0-9]{1,4})"
-    girobank = r"(GIR0AA)"
-    pattern = r"{}|{}|{}".format(standard, bfpo, girobank)
+_real_uk_postcode = re.compile(
+    r"{}|{}|{}".format(
+        r"([A-Z]{1,2}[0-9][0-9A-Z]?[0-9][A-BD-HJLNP-UW-Z]{2})",  # standard
+        r"(BFPO?(C\/O)?[0-9]{1,4})",  # bfpo
+        r"(GIR0AA)",  # girobank
+    )
+)
 
-    return bool(re.fullmatch(pattern, normalise_postcode(postcode)))
+
+def is_a_real_uk_postcode(postcode):
+    return bool(_real_uk_postcode.fullmatch(normalise_postcode(postcode)))
 
 
 def format_postcode_for_printing(postcode):
@@ -176,10 +213,10 @@ def format_postcode_for_printing(postcode):
 
 
 # When processing an address we look at the postcode twice when
-# normalising it, and once when validating it. So 8 is chosen because
-# it’s 3, doubled to give some headroom then rounded up to the nearest
-# power of 2
-@lru_cache(maxsize=8)
+# normalising it, and once when validating it. The cache is big enough
+# to also reuse the result across the addresses in a spreadsheet, which
+# tend to share postcodes.
+@lru_cache(maxsize=1024)
 def format_postcode_or_none(postcode):
     if is_a_real_uk_postcode(postcode):
         return format_postcode_for_printing(postcode)
@@ -1,11 +1,17 @@
+import codecs
 import csv
+import mmap
+import os
 import re
 import sys
-from collections import namedtuple
+from collections import Counter, deque, namedtuple
+from collections.abc import Mapping, Sequence, Set
+from concurrent.futures import Future, ProcessPoolExecutor
 from contextlib import suppress
-from functools import lru_cache
+from copy import copy
+from functools import lru_cache, partial
 from io import StringIO
-from itertools import islice
+from itertools import chain, islice
 
 import phonenumbers
 from flask import current_app
@@ -13,6 +19,7 @@ from ordered_set import OrderedSet
 from phonenumbers.phonenumberutil import NumberParseException
 
 from notifications_utils.formatters import (
+    ALL_WHITESPACE,
     strip_all_whitespace,
     strip_and_remove_obscure_whitespace,
 )
@@ -21,15 +28,18 @@ from notifications_utils.international_billing_rates import (
     INTERNATIONAL_BILLING_RATES,
 )
 from notifications_utils.postal_address import (
+    PostalAddress,
     address_line_7_key,
     address_lines_1_to_6_and_postcode_keys,
     address_lines_1_to_7_keys,
+    validate_postal_addresses,
 )
 from notifications_utils.template import Template
 
 from . import EMAIL_REGEX_PATTERN, hostname_part, tld_part
 
 us_prefix = "1"
+email_regex = re.compile(EMAIL_REGEX_PATTERN)
 
 first_column_headings = {
     "email": ["email address"],
@@ -42,9 +52,36 @@ first_column_headings = {
 
 address_columns = InsensitiveDict.from_keys(first_column_headings["letter"])
 
+Column = namedtuple(
+    "Column",
+    [
+        "header",
+        "key",
+        "is_recipient_column",
+        "is_placeholder",
+        "is_address_column",
+        "validator",
+    ],
+)
+
+# What validating a row’s recipients in a batch with other rows found out.
+# `recipient_errors` has an error, or `None`, for each recipient in the
+# row. `has_bad_postal_address` is `None` if the address hasn’t been
+# checked yet.
+RecipientValidation = namedtuple(
+    "RecipientValidation",
+    [
+        "recipient_errors",
+        "has_bad_postal_address",
+    ],
+)
+
+_NOT_VALIDATED = RecipientValidation({}, None)
+
 
 class RecipientCSV:
     max_rows = 100_000
+    recipients_validated_at_once = 1_000
 
     def __init__(
         self,
@@ -57,23 +94,88 @@ class RecipientCSV:
         allow_international_sms=False,
         allow_international_letters=False,
         should_validate=True,
+        max_workers=1,
     ):
-        self.file_data = strip_all_whitespace(file_data, extra_characters=",")
+        self.file_data = strip_all_whitespace(file_data, extra_characters=",").strip()
+        self._file = None
         self.max_errors_shown = max_errors_shown
         self.max_initial_rows_shown = max_initial_rows_shown
         self.guestlist = guestlist
+        self.rows_as_list = None
         self.template = template
         self.allow_international_sms = allow_international_sms
         self.allow_international_letters = allow_international_letters
         self.remaining_messages = remaining_messages
-        self.rows_as_list = None
         self.should_validate = should_validate
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_file(cls, file, template, *, encoding="utf-8", **kwargs):
+        """
+        Like `RecipientCSV(file_data, template)`, but reads the spreadsheet
+        from a path, a binary file object or an `mmap` rather than a string.
+        Files are memory mapped where possible and each line is decoded as
+        it’s read, so the whole file never needs to be held as a string.
+
+        A file object is read from its current position, like `file.read()`
+        would. Bytes and `mmap`s are read from the start.
+
+        Call `close`, or use the `RecipientCSV` as a context manager, to
+        release a file which has been memory mapped. There’s no `file_data`,
+        because the file is never read into a string.
+        """
+        recipient_csv = cls("", template, **kwargs)
+        recipient_csv._file = _SpreadsheetFile.open(file, encoding=encoding)
+        return recipient_csv
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+    @property
+    def file_data(self):
+        if self._file:
+            raise AttributeError(
+                "RecipientCSV.from_file doesn't read the file into file_data"
+            )
+        return self._file_data
+
+    @file_data.setter
+    def file_data(self, value):
+        self._file_data = value
 
     def __len__(self):
         if not hasattr(self, "_len"):
-            self._len = len(self.rows)
+            self._len = self.count_rows()
         return self._len
 
+    def count_rows(self, *, stop_after=None):
+        """
+        Counts the rows in the file, not including the header row, without
+        building or validating them. If `stop_after` is given then counting
+        stops as soon as there are more rows than that, so the count is at
+        most `stop_after + 1`.
+        """
+        if self.rows_as_list is not None:
+            count = len(self.rows_as_list)
+        else:
+            rows_as_lists_of_columns = self._rows
+            next(rows_as_lists_of_columns, None)  # skip the header row
+            if stop_after is not None:
+                rows_as_lists_of_columns = islice(
+                    rows_as_lists_of_columns, min(stop_after + 1, sys.maxsize)
+                )
+            count = sum(1 for _row in rows_as_lists_of_columns)
+        if stop_after is not None:
+            return min(count, stop_after + 1)
+        return count
+
     def __getitem__(self, requested_index):
         return self.rows[requested_index]
 
@@ -83,10 +185,13 @@ class RecipientCSV:
 
     @guestlist.setter
     def guestlist(self, value):
+        if isinstance(value, GuestList):
+            self._guestlist = value
+            return
         try:
-            self._guestlist = list(value)
+            self._guestlist = GuestList(value)
         except TypeError:
-            self._guestlist = []
+            self._guestlist = GuestList()
 
     @property
     def template(self):
@@ -99,11 +204,20 @@ class RecipientCSV:
                 "template must be an instance of "
                 "notifications_utils.template.Template"
             )
+        previous_template_type = getattr(self, "template_type", None)
         self._template = value
         self.template_type = self._template.template_type
         self.recipient_column_headers = first_column_headings[self.template_type]
         self.placeholders = self._template.placeholders
 
+        if self.rows_as_list is None:
+            return
+        if self.template_type == previous_template_type:
+            self._rebind_rows()
+        else:
+            # Different recipient columns, so everything needs validating again
+            self.rows_as_list = None
+
     @property
     def placeholders(self):
         return self._placeholders
@@ -121,6 +235,142 @@ class RecipientCSV:
             InsensitiveDict.make_key(placeholder)
             for placeholder in self.recipient_column_headers
         ]
+        # The plan depends on the placeholders, so must be worked out again
+        self._column_plan = None
+
+    @property
+    def column_plan(self):
+        """
+        A `Column` for each column in the file, in the same order as the
+        header row. This is worked out once per file so that building and
+        validating each row only needs lookups, not string normalisation.
+        """
+        if self._column_plan is None:
+            self._work_out_column_plan()
+        return self._column_plan
+
+    @property
+    def _columns_by_header(self):
+        if self._column_plan is None:
+            self._work_out_column_plan()
+        return self._column_plan_by_header
+
+    @property
+    def _columns_by_key(self):
+        if self._column_plan is None:
+            self._work_out_column_plan()
+        return self._column_plan_by_key
+
+    def _work_out_column_plan(self):
+        self._column_plan = [
+            self._plan_column(header) for header in self._raw_column_headers
+        ]
+        self._column_plan_by_header = {
+            column.header: column for column in self._column_plan
+        }
+        self._column_plan_by_header[None] = self._plan_column(None)
+        self._column_plan_by_key = {
+            column.key: column for column in self._column_plan_by_header.values()
+        }
+        self._has_duplicate_recipient_columns = bool(
+            self.duplicate_recipient_column_headers
+        )
+
+    def _plan_column(self, header):
+        key = InsensitiveDict.make_key(header)
+        is_recipient_column = key in self.recipient_column_headers_as_column_keys
+        return Column(
+            header=header,
+            key=key,
+            is_recipient_column=is_recipient_column,
+            is_placeholder=key in self.placeholders_as_column_keys,
+            is_address_column=self.is_address_column(header),
+            validator=(self._recipient_validator if is_recipient_column else None),
+        )
+
+    @property
+    def _recipient_validator(self):
+        return {
+            "email": validate_email_address,
+            "sms": self._validate_phone_number,
+        }.get(self.template_type)
+
+    def _validate_phone_number(self, number):
+        return validate_phone_number(number, international=self.allow_international_sms)
+
+    def _validate_phone_numbers(self, numbers):
+        return validate_phone_numbers(
+            numbers, international=self.allow_international_sms
+        )
+
+    @property
+    def _bulk_recipient_validator(self):
+        return {
+            "email": validate_email_addresses,
+            "sms": self._validate_phone_numbers,
+        }.get(self.template_type)
+
+    def _validate_recipients_in(self, row_dicts):
+        # Validating a whole batch of recipients at once means each distinct
+        # one is only validated once. Returns a `RecipientValidation` for
+        # each row, so that nothing about the batch is kept once its rows
+        # have been used.
+        if self.template_type == "letter":
+            return self._validate_postal_addresses_in(row_dicts)
+        bulk_validator = self._bulk_recipient_validator
+        if not bulk_validator:
+            return [_NOT_VALIDATED] * len(row_dicts)
+        recipient_headers = [
+            column.header for column in self.column_plan if column.is_recipient_column
+        ]
+        recipients_by_row = [
+            (
+                [
+                    recipient
+                    for header in recipient_headers
+                    if isinstance(recipient := row_dict.get(header), str)
+                ]
+                if row_dict
+                else []
+            )
+            for _index, row_dict in row_dicts
+        ]
+        recipients = list(chain.from_iterable(recipients_by_row))
+        recipient_errors = {
+            recipient: (str(result) if isinstance(result, Exception) else None)
+            for recipient, result in zip(recipients, bulk_validator(recipients))
+        }
+        return [
+            RecipientValidation(
+                {
+                    recipient: recipient_errors[recipient]
+                    for recipient in row_recipients
+                },
+                None,
+            )
+            for row_recipients in recipients_by_row
+        ]
+
+    def _validate_postal_addresses_in(self, row_dicts):
+        raw_addresses = [
+            PostalAddress.raw_address_from_personalisation(InsensitiveDict(row_dict))
+            for _index, row_dict in row_dicts
+            if row_dict is not None
+        ]
+        valid = iter(
+            validate_postal_addresses(
+                raw_addresses,
+                allow_international_letters=self.allow_international_letters,
+            )
+        )
+        return [
+            (
+                _NOT_VALIDATED
+                if row_dict is None
+                else RecipientValidation({}, not next(valid))
+            )
+            for _index, row_dict in row_dicts
+        ]
 
     @property
     def has_errors(self):
@@ -146,71 +396,234 @@ class RecipientCSV:
     @property
     def rows(self):
         if self.rows_as_list is None:
-            self.rows_as_list = list(self.get_rows())
+            if self.max_workers > 1:
+                self.rows_as_list = self._new_columnar_rows()
+                for chunk in self._get_chunks_in_parallel(self.max_workers):
+                    self.rows_as_list.extend(chunk)
+            else:
+                rows_as_lists_of_columns = self._rows
+                next(rows_as_lists_of_columns, None)  # skip the header row
+                self.rows_as_list = self._get_columnar_rows_from(
+                    rows_as_lists_of_columns
+                )
         return self.rows_as_list
 
+    def _rebind_rows(self):
+        # Parsing the file and validating the recipients don’t depend on the
+        # template, so only the checks which do are made again
+        if self.should_validate:
+            error_fn, template = self._get_error_for_key, self.template
+        else:
+            error_fn, template = None, None
+
+        self.rows_as_list.rebind(
+            placeholders=self.placeholders_as_column_keys,
+            error_fn=error_fn,
+            template=template,
+        )
+
     @property
     def _rows(self):
         return csv.reader(
-            StringIO(self.file_data.strip()),
+            self._file.lines() if self._file else _lines_of(self.file_data),
             quoting=csv.QUOTE_MINIMAL,
             skipinitialspace=True,
         )
 
     def get_rows(self):
-        column_headers = self._raw_column_headers  # this is for caching
-        length_of_column_headers = len(column_headers)
+        rows_as_lists_of_columns = self._rows
+
+        next(rows_as_lists_of_columns, None)  # skip the header row
+
+        return self._get_rows_from(rows_as_lists_of_columns)
 
+    def get_rows_in_parallel(self, max_workers=None, rows_per_chunk=2_000):
+        """
+        Like `get_rows`, but the rows are split into chunks which are
+        validated in a pool of processes. Rows are yielded in the same
+        order, with the same indexes and errors, as `get_rows`.
+        """
+        for chunk in self._get_chunks_in_parallel(max_workers, rows_per_chunk):
+            yield from chunk
+
+    def _get_chunks_in_parallel(self, max_workers=None, rows_per_chunk=2_000):
         rows_as_lists_of_columns = self._rows
 
         next(rows_as_lists_of_columns, None)  # skip the header row
 
-        for index, row in enumerate(rows_as_lists_of_columns):
-            if index >= self.max_rows:
+        chunks = _chunk_rows(rows_as_lists_of_columns, rows_per_chunk)
+        recipient_csv_without_rows = self._copy_without_rows()
+        max_workers = max_workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Only keep a couple of chunks per worker in flight so that
+            # memory use doesn’t grow with the size of the file
+            max_chunks_in_flight = 2 * max_workers
+            in_flight = deque()
+            for start_index, chunk in chunks:
+                if start_index >= self.max_rows:
+                    rows_beyond_max = self._new_columnar_rows(first_index=start_index)
+                    rows_beyond_max.count_of_rows_beyond_max = len(chunk)
+                    in_flight.append(rows_beyond_max)
+                else:
+                    in_flight.append(
+                        executor.submit(
+                            _get_rows_for_chunk,
+                            recipient_csv_without_rows,
+                            chunk,
+                            start_index,
+                        )
+                    )
+                while len(in_flight) > max_chunks_in_flight:
+                    yield _result_of(in_flight.popleft())
+            while in_flight:
+                yield _result_of(in_flight.popleft())
+
+    def _get_rows_using_all_workers(self):
+        if self.max_workers > 1:
+            return self.get_rows_in_parallel(max_workers=self.max_workers)
+        return self.get_rows()
+
+    def _copy_without_rows(self):
+        # Worker processes only need the header row to validate a chunk,
+        # so avoid pickling the whole file for each one
+        header_row = StringIO()
+        csv.writer(header_row, quoting=csv.QUOTE_ALL).writerow(self._raw_column_headers)
+        recipient_csv = copy(self)
+        recipient_csv.file_data = header_row.getvalue()
+        recipient_csv._file = None
+        recipient_csv.rows_as_list = None
+        # The plan refers back to this instance, which holds the whole file
+        recipient_csv._column_plan = None
+        return recipient_csv
+
+    def _get_rows_from(self, rows_as_lists_of_columns, start_index=0):
+        for index, row_dict, validation in self._get_row_dicts_from(
+            rows_as_lists_of_columns, start_index
+        ):
+            if row_dict is None:
                 yield None
                 continue
 
+            yield Row(
+                row_dict,
+                index=index,
+                error_fn=partial(
+                    self._get_error_for_field,
+                    recipient_errors=validation.recipient_errors,
+                ),
+                recipient_column_headers=self.recipient_column_headers,
+                placeholders=self.placeholders_as_column_keys,
+                template=self.template,
+                allow_international_letters=self.allow_international_letters,
+                validate_row=self.should_validate,
+                has_bad_postal_address=validation.has_bad_postal_address,
+            )
+
+    def _get_columnar_rows_from(self, rows_as_lists_of_columns, start_index=0):
+        rows = self._new_columnar_rows(first_index=start_index)
+
+        template = self.template if self.should_validate else None
+
+        for _index, row_dict, validation in self._get_row_dicts_from(
+            rows_as_lists_of_columns, start_index
+        ):
+            if row_dict is None:
+                rows.count_of_rows_beyond_max += 1
+            else:
+                rows.append(
+                    row_dict,
+                    error_fn=(
+                        partial(
+                            self._get_error_for_field,
+                            recipient_errors=validation.recipient_errors,
+                        )
+                        if self.should_validate
+                        else None
+                    ),
+                    template=template,
+                    has_bad_postal_address=validation.has_bad_postal_address,
+                )
+
+        return rows
+
+    def _new_columnar_rows(self, first_index=0):
+        return ColumnarRows(
+            keys_by_header={column.header: column.key for column in self.column_plan},
+            first_index=first_index,
+            recipient_column_headers=self.recipient_column_headers,
+            placeholders=self.placeholders_as_column_keys,
+            template_type=self.template_type if self.should_validate else None,
+            allow_international_letters=self.allow_international_letters,
+        )
+
+    def _get_row_dicts_from(self, rows_as_lists_of_columns, start_index=0):
+        row_dicts = self._get_unvalidated_row_dicts_from(
+            rows_as_lists_of_columns, start_index
+        )
+        if not self.should_validate:
+            for index, row_dict in row_dicts:
+                yield index, row_dict, _NOT_VALIDATED
+            return
+        for _start_index, batch in _chunk_rows(
+            row_dicts, self.recipients_validated_at_once
+        ):
+            for (index, row_dict), validation in zip(
+                batch, self._validate_recipients_in(batch)
+            ):
+                yield index, row_dict, validation
+
+    def _get_unvalidated_row_dicts_from(self, rows_as_lists_of_columns, start_index=0):
+        column_plan = self.column_plan
+        number_of_columns = len(column_plan)
+
+        for index, row in enumerate(rows_as_lists_of_columns, start=start_index):
+            if index >= self.max_rows:
+                yield index, None
+                continue
+
             output_dict = {}
 
-            for column_name, column_value in zip(column_headers, row):
+            for column, column_value in zip(column_plan, row):
                 column_value = strip_and_remove_obscure_whitespace(column_value)
 
-                if (
-                    InsensitiveDict.make_key(column_name)
-                    in self.recipient_column_headers_as_column_keys
-                ):
-                    output_dict[column_name] = column_value or None
+                if column.is_recipient_column:
+                    output_dict[column.header] = column_value or None
                 else:
                     insert_or_append_to_dict(
-                        output_dict, column_name, column_value or None
+                        output_dict, column.header, column_value or None
                     )
 
             length_of_row = len(row)
 
-            if length_of_column_headers < length_of_row:
-                output_dict[None] = row[length_of_column_headers:]
-            elif length_of_column_headers > length_of_row:
-                for key in column_headers[length_of_row:]:
-                    insert_or_append_to_dict(output_dict, key, None)
+            if number_of_columns < length_of_row:
+                output_dict[None] = row[number_of_columns:]
+            elif number_of_columns > length_of_row:
+                for column in column_plan[length_of_row:]:
+                    insert_or_append_to_dict(output_dict, column.header, None)
 
-            yield Row(
-                output_dict,
-                index=index,
-                error_fn=self._get_error_for_field,
-                recipient_column_headers=self.recipient_column_headers,
-                placeholders=self.placeholders_as_column_keys,
-                template=self.template,
-                allow_international_letters=self.allow_international_letters,
-                validate_row=self.should_validate,
-            )
+            yield index, output_dict
+
+    def summarise(self):
+        """
+        Validates the whole file in a single pass without keeping every row
+        in memory. Use this instead of `rows` for big files where only the
+        counts and the rows shown to the user are needed.
+        """
+        return RecipientCSVSummary(self)
 
     @property
     def more_rows_than_can_send(self):
-        return len(self) > self.remaining_messages
+        return self._has_more_rows_than(self.remaining_messages)
 
     @property
     def too_many_rows(self):
-        return len(self) > self.max_rows
+        return self._has_more_rows_than(self.max_rows)
+
+    def _has_more_rows_than(self, number_of_rows):
+        if hasattr(self, "_len"):
+            return self._len > number_of_rows
+        return self.count_rows(stop_after=number_of_rows) > number_of_rows
 
     @property
     def initial_rows(self):
@@ -276,22 +689,14 @@ class RecipientCSV:
 
     @property
     def duplicate_recipient_column_headers(self):
-        raw_recipient_column_headers = [
-            InsensitiveDict.make_key(column_header)
-            for column_header in self._raw_column_headers
-            if InsensitiveDict.make_key(column_header)
-            in self.recipient_column_headers_as_column_keys
-        ]
+        count_of_recipient_columns = Counter(
+            column.key for column in self.column_plan if column.is_recipient_column
+        )
 
         return OrderedSet(
-            (
-                column_header
-                for column_header in self._raw_column_headers
-                if raw_recipient_column_headers.count(
-                    InsensitiveDict.make_key(column_header)
-                )
-                > 1
-            )
+            column.header
+            for column in self.column_plan
+            if count_of_recipient_columns[column.key] > 1
         )
 
     def is_address_column(self, key):
@@ -330,40 +735,409 @@ class RecipientCSV:
 
         return False
 
-    def _get_error_for_field(self, key, value):  # noqa: C901
-        if self.is_address_column(key):
+    def _get_error_for_field(self, key, value, recipient_errors=None):
+        column = self._columns_by_header.get(key) or self._plan_column(key)
+        return self._get_error_for_column(column, value, recipient_errors)
+
+    def _get_error_for_key(self, key, value):
+        column = self._columns_by_key.get(key) or self._plan_column(key)
+        return self._get_error_for_column(column, value)
+
+    def _get_error_for_column(self, column, value, recipient_errors=None):  # noqa: C901
+        if column.is_address_column:
             return
 
-        if (
-            InsensitiveDict.make_key(key)
-            in self.recipient_column_headers_as_column_keys
-        ):
+        if column.is_recipient_column:
             if value in [None, ""] or isinstance(value, list):
-                if self.duplicate_recipient_column_headers:
+                if self._has_duplicate_recipient_columns:
                     return None
                 else:
                     return Cell.missing_field_error
 
+            if recipient_errors and value in recipient_errors:
+                return recipient_errors[value]
+
             try:
-                if self.template_type == "email":
-                    validate_email_address(value)
-                if self.template_type == "sms":
-                    validate_phone_number(
-                        value, international=self.allow_international_sms
-                    )
+                if column.validator:
+                    column.validator(value)
             except (InvalidEmailError, InvalidPhoneError) as error:
                 return str(error)
 
-        if InsensitiveDict.make_key(key) not in self.placeholders_as_column_keys:
+        if not column.is_placeholder:
             return
 
         if value in [None, ""]:
             return Cell.missing_field_error
 
 
-class Row(InsensitiveDict):
-    message_too_long = False
-    message_empty = False
+class _SpreadsheetFile:
+    """
+    A spreadsheet held as bytes, usually in an `mmap`. Each time it’s read
+    the lines from `start` onwards are decoded one at a time, and stripped
+    of whitespace and commas at the start and end of the file the same way
+    as a spreadsheet passed to `RecipientCSV` as a string.
+
+    An `mmap` made by `open` is closed by `close`. Anything else is left
+    for whoever passed it in to close.
+    """
+
+    def __init__(self, data, *, encoding="utf-8", start=0, owns_data=False):
+        self.data = data
+        self.encoding = encoding
+        self.start = start
+        self.owns_data = owns_data
+
+    @classmethod
+    def open(cls, file, *, encoding="utf-8"):
+        if isinstance(file, (bytes, mmap.mmap)):
+            return cls(file, encoding=encoding)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as opened_file:
+                return cls._map(opened_file, encoding=encoding)
+        try:
+            return cls._map(file, encoding=encoding)
+        except (AttributeError, OSError):
+            # Not backed by a file on disk, for example a stream from S3
+            return cls(file.read(), encoding=encoding)
+
+    @classmethod
+    def _map(cls, file, *, encoding):
+        return cls(
+            _map_file(file), encoding=encoding, start=file.tell(), owns_data=True
+        )
+
+    def close(self):
+        if self.owns_data and isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def lines(self):
+        lines = _strip_lines(self._decoded_lines(), ALL_WHITESPACE + ",")
+        return _strip_lines(lines)
+
+    def _decoded_lines(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        for line in _lines_of(self.data, start=self.start):
+            if decoded_line := decoder.decode(line):
+                yield decoded_line
+        if decoded_line := decoder.decode(b"", final=True):
+            yield decoded_line
+
+
+class RecipientCSVSummary:
+    """
+    The result of validating a `RecipientCSV` row by row. Only counts and
+    the first few rows (the ones we show to the user) are kept, so memory
+    use stays the same however many rows the file has.
+    """
+
+    def __init__(self, recipient_csv):
+        self.max_rows = recipient_csv.max_rows
+        self.remaining_messages = recipient_csv.remaining_messages
+        self.missing_column_headers = recipient_csv.missing_column_headers
+        self.duplicate_recipient_column_headers = (
+            recipient_csv.duplicate_recipient_column_headers
+        )
+
+        self.row_count = 0
+        self.count_of_rows_with_errors = 0
+        self.count_of_rows_with_bad_recipients = 0
+        self.count_of_rows_with_missing_data = 0
+        self.count_of_rows_with_message_too_long = 0
+        self.count_of_rows_with_empty_message = 0
+        self.initial_rows = []
+        self.initial_rows_with_errors = []
+        self.allowed_to_send_to = True
+
+        self._count_rows(recipient_csv)
+
+    def __len__(self):
+        return self.row_count
+
+    def _count_rows(self, recipient_csv):  # noqa: C901
+        guestlist = recipient_csv.template_type != "letter" and recipient_csv.guestlist
+
+        for row in recipient_csv._get_rows_using_all_workers():
+            self.row_count += 1
+
+            if len(self.initial_rows) < recipient_csv.max_initial_rows_shown:
+                self.initial_rows.append(row)
+
+            if not row:
+                continue
+
+            if (
+                guestlist
+                and self.allowed_to_send_to
+                and not allowed_to_send_to(row.recipient, guestlist)
+            ):
+                self.allowed_to_send_to = False
+
+            if not row.has_error:
+                continue
+
+            self.count_of_rows_with_errors += 1
+            if len(self.initial_rows_with_errors) < recipient_csv.max_errors_shown:
+                self.initial_rows_with_errors.append(row)
+
+            if row.has_bad_recipient:
+                self.count_of_rows_with_bad_recipients += 1
+            if row.has_missing_data:
+                self.count_of_rows_with_missing_data += 1
+            if row.message_too_long:
+                self.count_of_rows_with_message_too_long += 1
+            if row.message_empty:
+                self.count_of_rows_with_empty_message += 1
+
+    @property
+    def more_rows_than_can_send(self):
+        return self.row_count > self.remaining_messages
+
+    @property
+    def too_many_rows(self):
+        return self.row_count > self.max_rows
+
+    @property
+    def has_errors(self):
+        return bool(
+            self.missing_column_headers
+            or self.duplicate_recipient_column_headers
+            or self.more_rows_than_can_send
+            or self.too_many_rows
+            or (not self.allowed_to_send_to)
+            or self.count_of_rows_with_errors
+        )
+
+    @property
+    def displayed_rows(self):
+        if self.count_of_rows_with_errors and not self.missing_column_headers:
+            return self.initial_rows_with_errors
+        return self.initial_rows
+
+
+class _NotInRow:
+    """
+    Marks a cell which a row doesn’t have, as opposed to one which is
+    empty. Pickled by name so it’s still the same object after a row
+    has been sent to another process.
+    """
+
+    def __repr__(self):
+        return "_NOT_IN_ROW"
+
+    def __reduce__(self):
+        return "_NOT_IN_ROW"
+
+
+_NOT_IN_ROW = _NotInRow()
+
+
+class ColumnarRows(Sequence):
+    """
+    Stores the rows of a spreadsheet column by column, rather than as one
+    dictionary of `Cell`s per row. Column keys are normalised once, errors
+    are only stored for the cells which have them, and `Row` objects are
+    created on demand as views onto the stored columns.
+
+    Rows beyond `RecipientCSV.max_rows` aren’t stored, and are returned as
+    `None`.
+    """
+
+    def __init__(
+        self,
+        *,
+        keys_by_header=None,
+        first_index=0,
+        recipient_column_headers,
+        placeholders,
+        template_type,
+        allow_international_letters,
+    ):
+        self.first_index = first_index
+        self.recipient_column_headers = recipient_column_headers
+        self.placeholders = placeholders
+        self.template_type = template_type
+        self.allow_international_letters = allow_international_letters
+        self.count_of_rows_beyond_max = 0
+        self._count_of_stored_rows = 0
+        self._keys_by_header = dict(keys_by_header or {})
+        self._columns = {key: [] for key in self._keys_by_header.values()}
+        self._errors = {}
+        self._rows_with_message_too_long = set()
+        self._rows_with_empty_message = set()
+        self._rows_with_bad_postal_address = set()
+
+    def __len__(self):
+        return self._count_of_stored_rows + self.count_of_rows_beyond_max
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("row index out of range")
+        if position >= self._count_of_stored_rows:
+            return None
+        return Row.from_columns(self, position)
+
+    def append(self, row_dict, *, error_fn, template, has_bad_postal_address=None):
+        position = self._count_of_stored_rows
+        self._count_of_stored_rows += 1
+
+        if template:
+            self._check_message(position, row_dict, template)
+
+        errors = {}
+
+        for original_key, value in row_dict.items():
+            key = self._key_for(original_key)
+            self._store(position, key, value)
+
+            error = error_fn(original_key, value) if error_fn else None
+            if error:
+                errors[key] = error
+            else:
+                errors.pop(key, None)
+
+        for column in self._columns.values():
+            if len(column) == position:
+                column.append(_NOT_IN_ROW)
+
+        if errors:
+            self._errors[position] = errors
+
+        if self.template_type == "letter":
+            self._check_postal_address(position, has_bad_postal_address)
+
+    def _store(self, position, key, value):
+        column = self._columns.get(key)
+
+        if column is None:
+            column = self._columns[key] = [_NOT_IN_ROW] * position
+
+        if len(column) > position:
+            # Two columns have the same name once normalised, so the
+            # last one wins, like it does in a dictionary
+            column[position] = value
+        else:
+            column.append(value)
+
+    def _key_for(self, header):
+        try:
+            return self._keys_by_header[header]
+        except KeyError:
+            key = self._keys_by_header[header] = InsensitiveDict.make_key(header)
+            return key
+
+    def _check_message(self, position, row_dict, template):
+        template.values = row_dict
+        # we do not validate email size for CSVs to avoid performance issues
+        if template.template_type != "email" and template.is_message_too_long():
+            self._rows_with_message_too_long.add(position)
+        if template.is_message_empty():
+            self._rows_with_empty_message.add(position)
+
+    def _check_postal_address(self, position, has_bad_postal_address):
+        # Parsing an address is slow, so it’s only done once per row, if
+        # it hasn’t already been done for a whole batch of rows
+        if has_bad_postal_address is None:
+            has_bad_postal_address = not self._postal_address(position).valid
+        if has_bad_postal_address:
+            self._rows_with_bad_postal_address.add(position)
+
+    def rebind(self, *, placeholders, error_fn, template):
+        """
+        Checks the stored rows against a new template which has the same
+        recipient columns. Errors in recipient columns are kept, everything
+        which depends on the template is checked again.
+        """
+        self.placeholders = placeholders
+        self._rows_with_message_too_long = set()
+        self._rows_with_empty_message = set()
+
+        recipient_keys = {
+            InsensitiveDict.make_key(header) for header in self.recipient_column_headers
+        }
+        for key, column in self._columns.items():
+            if key in recipient_keys:
+                continue
+            for position, value in enumerate(column):
+                if value is not _NOT_IN_ROW:
+                    self._store_error(
+                        position, key, error_fn(key, value) if error_fn else None
+                    )
+
+        if template:
+            for position in range(self._count_of_stored_rows):
+                self._check_message(position, self._row_dict(position), template)
+
+    def _store_error(self, position, key, error):
+        if error:
+            self._errors.setdefault(position, {})[key] = error
+        elif key in self._errors.get(position, {}):
+            del self._errors[position][key]
+            if not self._errors[position]:
+                del self._errors[position]
+
+    def _postal_address(self, position):
+        return PostalAddress.from_personalisation(
+            InsensitiveDict.from_normalised_keys(self._row_dict(position)),
+            allow_international_letters=self.allow_international_letters,
+        )
+
+    def _row_dict(self, position):
+        return {
+            key: self._columns[key][position] for key in self._keys_for_row(position)
+        }
+
+    def extend(self, other):
+        offset = self._count_of_stored_rows
+
+        for key, values in other._columns.items():
+            self._columns.setdefault(key, [_NOT_IN_ROW] * offset).extend(values)
+
+        self._count_of_stored_rows += other._count_of_stored_rows
+
+        for column in self._columns.values():
+            if len(column) < self._count_of_stored_rows:
+                column.extend(
+                    [_NOT_IN_ROW] * (self._count_of_stored_rows - len(column))
+                )
+
+        self._errors.update(
+            (position + offset, errors) for position, errors in other._errors.items()
+        )
+        self._rows_with_message_too_long.update(
+            position + offset for position in other._rows_with_message_too_long
+        )
+        self._rows_with_empty_message.update(
+            position + offset for position in other._rows_with_empty_message
+        )
+        self._rows_with_bad_postal_address.update(
+            position + offset for position in other._rows_with_bad_postal_address
+        )
+        self.count_of_rows_beyond_max += other.count_of_rows_beyond_max
+
+    def _keys_for_row(self, position):
+        return (
+            key
+            for key, column in self._columns.items()
+            if column[position] is not _NOT_IN_ROW
+        )
+
+    def _cell(self, position, key):
+        column = self._columns.get(key)
+        if column is None or column[position] is _NOT_IN_ROW:
+            return Cell()
+        return Cell.from_columns(
+            column[position],
+            self._errors.get(position, {}).get(key),
+            key not in self.placeholders,
+        )
+
+
+class Row(Mapping):
+    __slots__ = ("_columns", "_position", "index")
 
     def __init__(
         self,
@@ -376,50 +1150,95 @@ class Row(InsensitiveDict):
         template,
         allow_international_letters,
         validate_row=True,
+        has_bad_postal_address=None,
     ):
         # If we don't need to validate, then:
         # by not setting template we avoid the template level validation (used to check message length)
-        # by not setting error_fn, we avoid the Cell.__init__ validation (used to check phone nums are valid,
+        # by not setting error_fn, we avoid the cell level validation (used to check phone nums are valid,
         # placeholders are present, etc)
         if not validate_row:
             template = None
             error_fn = None
 
+        self._columns = ColumnarRows(
+            first_index=index,
+            recipient_column_headers=recipient_column_headers,
+            placeholders=placeholders,
+            template_type=template.template_type if template else None,
+            allow_international_letters=allow_international_letters,
+        )
+        self._columns.append(
+            row_dict,
+            error_fn=error_fn,
+            template=template,
+            has_bad_postal_address=has_bad_postal_address,
+        )
+        self._position = 0
         self.index = index
-        self.recipient_column_headers = recipient_column_headers
-        self.placeholders = placeholders
-        self.allow_international_letters = allow_international_letters
 
-        if template:
-            template.values = row_dict
-            self.template_type = template.template_type
-            # we do not validate email size for CSVs to avoid performance issues
-            if self.template_type == "email":
-                self.message_too_long = False
-            else:
-                self.message_too_long = template.is_message_too_long()
-            self.message_empty = template.is_message_empty()
-
-        super().__init__(
-            {
-                key: Cell(key, value, error_fn, self.placeholders)
-                for key, value in row_dict.items()
-            }
-        )
+    @classmethod
+    def from_columns(cls, columns, position):
+        row = cls.__new__(cls)
+        row._columns = columns
+        row._position = position
+        row.index = columns.first_index + position
+        return row
 
     def __getitem__(self, key):
-        return super().__getitem__(key) if key in self else Cell()
+        return self._columns._cell(self._position, InsensitiveDict.make_key(key))
+
+    def __contains__(self, key):
+        column = self._columns._columns.get(InsensitiveDict.make_key(key))
+        return column is not None and column[self._position] is not _NOT_IN_ROW
+
+    def __iter__(self):
+        return self._columns._keys_for_row(self._position)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def keys(self):
+        return OrderedSet(self)
 
     def get(self, key, default=None):
         if key not in self and default is not None:
             return default
         return self[key]
 
+    @property
+    def recipient_column_headers(self):
+        return self._columns.recipient_column_headers
+
+    @property
+    def placeholders(self):
+        return self._columns.placeholders
+
+    @property
+    def template_type(self):
+        return self._columns.template_type
+
+    @property
+    def allow_international_letters(self):
+        return self._columns.allow_international_letters
+
+    @property
+    def message_too_long(self):
+        return self._position in self._columns._rows_with_message_too_long
+
+    @property
+    def message_empty(self):
+        return self._position in self._columns._rows_with_empty_message
+
+    @property
+    def _errors(self):
+        return self._columns._errors.get(self._position, {})
+
     @property
     def has_error(self):
-        return self.has_error_spanning_multiple_cells or any(
-            cell.error for cell in self.values()
-        )
+        return self.has_error_spanning_multiple_cells or bool(self._errors)
 
     @property
     def has_bad_recipient(self):
@@ -429,7 +1248,7 @@ class Row(InsensitiveDict):
 
     @property
     def has_bad_postal_address(self):
-        return self.template_type == "letter" and not self.as_postal_address.valid
+        return self._position in self._columns._rows_with_bad_postal_address
 
     @property
     def has_error_spanning_multiple_cells(self):
@@ -439,7 +1258,7 @@ class Row(InsensitiveDict):
 
     @property
     def has_missing_data(self):
-        return any(cell.error == Cell.missing_field_error for cell in self.values())
+        return Cell.missing_field_error in self._errors.values()
 
     @property
     def recipient(self):
@@ -448,8 +1267,6 @@ class Row(InsensitiveDict):
 
     @property
     def as_postal_address(self):
-        from notifications_utils.postal_address import PostalAddress
-
         return PostalAddress.from_personalisation(
             self.recipient_and_personalisation,
             allow_international_letters=self.allow_international_letters,
@@ -457,16 +1274,20 @@ class Row(InsensitiveDict):
 
     @property
     def personalisation(self):
-        return InsensitiveDict(
+        return InsensitiveDict.from_normalised_keys(
             {key: cell.data for key, cell in self.items() if key in self.placeholders}
         )
 
     @property
     def recipient_and_personalisation(self):
-        return InsensitiveDict({key: cell.data for key, cell in self.items()})
+        return InsensitiveDict.from_normalised_keys(
+            {key: cell.data for key, cell in self.items()}
+        )
 
 
 class Cell:
+    __slots__ = ("data", "error", "ignore")
+
     missing_field_error = "Missing"
 
     def __init__(self, key=None, value=None, error_fn=None, placeholders=None):
@@ -474,6 +1295,14 @@ class Cell:
         self.error = error_fn(key, value) if error_fn else None
         self.ignore = InsensitiveDict.make_key(key) not in (placeholders or [])
 
+    @classmethod
+    def from_columns(cls, data, error, ignore):
+        cell = cls.__new__(cls)
+        cell.data = data
+        cell.error = error
+        cell.ignore = ignore
+        return cell
+
     def __eq__(self, other):
         if not other.__class__ == self.__class__:
             return False
@@ -624,6 +1453,58 @@ def validate_phone_number(number, international=False):
         raise InvalidPhoneError(exc._msg) from exc
 
 
+def validate_phone_numbers(numbers, international=False):
+    """
+    Validates lots of phone numbers at once, for example a column from a
+    spreadsheet. Returns a list with, for each of `numbers` in order, either
+    the normalised phone number or the `InvalidPhoneError` which
+    `validate_phone_number` would have raised for it.
+
+    Each distinct number is only validated once, and numbers which are
+    already in E.164 format don’t need parsing.
+    """
+    numbers = list(numbers)
+    results = {}
+    for number in numbers:
+        if number not in results:
+            results[number] = _validate_phone_number_or_get_error(number, international)
+    return [results[number] for number in numbers]
+
+
+def _validate_phone_number_or_get_error(number, international):
+    try:
+        if isinstance(number, str) and (
+            match := _us_e164_phone_number.fullmatch(number)
+        ):
+            return _validate_us_e164_phone_number(number, match, international)
+        return validate_phone_number(number, international=international)
+    except InvalidPhoneError as error:
+        return error
+
+
+# A 10 digit NANP number with a valid area code and exchange code, with
+# nothing which `phonenumbers.parse` would need to strip or normalise
+_us_e164_phone_number = re.compile(r"\+1([2-9][0-9]{2})[2-9][0-9]{6}")
+
+
+def _validate_us_e164_phone_number(number, match, international):
+    # Gives the same result as `validate_phone_number` but builds the
+    # parsed number directly, rather than parsing the string twice
+    is_us_number = match.group(1) not in _NANP_COUNTRY_AREA_CODES
+
+    if international and not is_us_number:
+        return number
+    if not is_us_number:
+        raise InvalidPhoneError("Not a US number")
+
+    parsed = phonenumbers.PhoneNumber(country_code=1, national_number=int(number[2:]))
+    if phonenumbers.is_valid_number(parsed):
+        return number
+    if phonenumbers.is_possible_number(parsed):
+        raise InvalidPhoneError("Phone number range is not in use")
+    raise InvalidPhoneError("Phone number is not possible")
+
+
 validate_and_format_phone_number = validate_phone_number
 
 
@@ -653,38 +1534,62 @@ def _do_simple_email_checks(match, email_address):
         raise InvalidEmailError
 
 
-def validate_email_address(email_address):  # noqa (C901 too complex)
+def validate_email_address(email_address):
     # almost exactly the same as by https://github.com/wtforms/wtforms/blob/master/wtforms/validators.py,
     # with minor tweaks for SES compatibility - to avoid complications we are a lot stricter with the local part
     # than neccessary - we don't allow any double quotes or semicolons to prevent SES Technical Failures
     email_address = strip_and_remove_obscure_whitespace(email_address)
-    match = re.match(EMAIL_REGEX_PATTERN, email_address)
+    match = email_regex.match(email_address)
 
     _do_simple_email_checks(match, email_address)
 
-    hostname = match.group(1)
+    if not _is_valid_hostname(match.group(1)):
+        raise InvalidEmailError
+
+    return email_address
+
+
+def validate_email_addresses(email_addresses):
+    """
+    Validates lots of email addresses at once, for example a column from a
+    spreadsheet. Returns a list with, for each of `email_addresses` in order,
+    either the stripped email address or the `InvalidEmailError` which
+    `validate_email_address` would have raised for it.
 
+    Each distinct address is only validated once, and the result of checking
+    each hostname is cached, because most addresses share a few domains.
+    """
+    email_addresses = list(email_addresses)
+    results = {}
+    for email_address in email_addresses:
+        if email_address not in results:
+            try:
+                results[email_address] = validate_email_address(email_address)
+            except InvalidEmailError as error:
+                results[email_address] = error
+    return [results[email_address] for email_address in email_addresses]
+
+
+@lru_cache(maxsize=10_000)
+def _is_valid_hostname(hostname):
     # idna = "Internationalized domain name" - this encode/decode cycle converts unicode into its accurate ascii
     # representation as the web uses. '例え.テスト'.encode('idna') == b'xn--r8jz45g.xn--zckzah'
     try:
         hostname = hostname.encode("idna").decode("ascii")
     except UnicodeError:
-        raise InvalidEmailError
+        return False
 
     parts = hostname.split(".")
 
     if len(hostname) > 253 or len(parts) < 2:
-        raise InvalidEmailError
+        return False
 
     for part in parts:
         if not part or len(part) > 63 or not hostname_part.match(part):
-            raise InvalidEmailError
+            return False
 
     # if the part after the last . is not a valid TLD then bail out
-    if not tld_part.match(parts[-1]):
-        raise InvalidEmailError
-
-    return email_address
+    return bool(tld_part.match(parts[-1]))
 
 
 def format_email_address(email_address):
@@ -724,8 +1629,94 @@ def format_phone_number_human_readable(phone_number):
     )
 
 
+class GuestList(Set):
+    """
+    The phone numbers and email addresses a service in trial mode is allowed
+    to send to. They are formatted once, when the guest list is created, so
+    checking a recipient against it only needs to format that recipient.
+
+    A guest list never changes, so it can be reused for every file a service
+    uploads until the service’s guest list is edited.
+    """
+
+    __slots__ = ("_formatted_recipients",)
+
+    def __init__(self, recipients=()):
+        self._formatted_recipients = frozenset(
+            format_recipient(recipient) for recipient in recipients
+        )
+
+    def __contains__(self, recipient):
+        return format_recipient(recipient) in self._formatted_recipients
+
+    def __iter__(self):
+        return iter(self._formatted_recipients)
+
+    def __len__(self):
+        return len(self._formatted_recipients)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({sorted(self._formatted_recipients)!r})"
+
+
 def allowed_to_send_to(recipient, allowlist):
-    return format_recipient(recipient) in {format_recipient(x) for x in allowlist}
+    if not isinstance(allowlist, GuestList):
+        allowlist = GuestList(allowlist)
+    return recipient in allowlist
+
+
+def _map_file(file):
+    fileno = file.fileno()
+    try:
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can’t be mapped
+        return b""
+
+
+def _lines_of(data, start=0):
+    # Like iterating over a file, but works on anything with a `find`
+    # method without copying it first, including `str`, `bytes` and `mmap`
+    newline = "\n" if isinstance(data, str) else b"\n"
+    while start < len(data):
+        end = data.find(newline, start) + 1 or len(data)
+        yield data[start:end]
+        start = end
+
+
+def _strip_lines(lines, characters=None):
+    # Gives the same lines as `"".join(lines).strip(characters)` would
+    # split into, only holding on to lines which might be at the end
+    lines = iter(lines)
+    for line in lines:
+        if line := line.lstrip(characters):
+            lines = chain([line], lines)
+            break
+    held_lines = []
+    for line in lines:
+        if line.rstrip(characters):
+            yield from held_lines
+            held_lines = [line]
+        else:
+            held_lines.append(line)
+    if held_lines and (line := held_lines[0].rstrip(characters)):
+        yield line
+
+
+def _chunk_rows(rows_as_lists_of_columns, rows_per_chunk):
+    start_index = 0
+    while chunk := list(islice(rows_as_lists_of_columns, rows_per_chunk)):
+        yield start_index, chunk
+        start_index += len(chunk)
+
+
+def _get_rows_for_chunk(recipient_csv, rows_as_lists_of_columns, start_index):
+    # Runs in a worker process, so must be importable at module level
+    return recipient_csv._get_columnar_rows_from(rows_as_lists_of_columns, start_index)
+
+
+def _result_of(chunk):
+    return chunk.result() if isinstance(chunk, Future) else chunk
 
 
 def insert_or_append_to_dict(dict_, key, value):
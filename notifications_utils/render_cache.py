@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+
+
+class RenderCache(ABC):
+    """
+    Remembers rendered templates by their `render_cache_key`. Counts how
+    many renders it has been able to save (`hits`) and how many it has
+    had to do (`misses`).
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, rendered):
+        pass
+
+    def get_or_render(self, key, render):
+        rendered = self.get(key)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = render()
+        self.set(key, rendered)
+        return rendered
+
+
+class LRURenderCache(RenderCache):
+    """
+    Keeps rendered templates in memory, forgetting the least recently used
+    once there are more than `max_size`.
+    """
+
+    def __init__(self, max_size=256):
+        super().__init__()
+        self.max_size = max_size
+        self._rendered = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._rendered)
+
+    def get(self, key):
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is not None:
+                self._rendered.move_to_end(key)
+            return rendered
+
+    def set(self, key, rendered):
+        with self._lock:
+            self._rendered[key] = rendered
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > self.max_size:
+                self._rendered.popitem(last=False)
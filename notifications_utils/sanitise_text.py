@@ -1,4 +1,5 @@
 import ast
+import re
 import unicodedata
 
 from regex import regex
@@ -27,7 +28,38 @@ class SanitiseText:
 
     @classmethod
     def encode(cls, content):
-        return "".join(cls.encode_char(char) for char in content)
+        if cls.is_fully_compatible(content):
+            return content
+        return content.translate(cls._get_encoding_table())
+
+    @classmethod
+    def is_fully_compatible(cls, content):
+        """
+        Returns `True` if every character in `content` is in the allowed set, so encoding it wouldn’t change it.
+
+        This is much quicker than encoding, so use it to skip the work for content which doesn’t need it.
+        """
+        return cls._get_allowed_characters_pattern().fullmatch(content) is not None
+
+    @classmethod
+    def _get_allowed_characters_pattern(cls):
+        try:
+            return cls.__dict__["_allowed_characters_pattern"]
+        except KeyError:
+            cls._allowed_characters_pattern = re.compile(
+                "[{}]*".format(re.escape("".join(sorted(cls.ALLOWED_CHARACTERS))))
+            )
+            return cls._allowed_characters_pattern
+
+    @classmethod
+    def _get_encoding_table(cls):
+        # Each class needs its own table, rather than one inherited from
+        # its parent
+        try:
+            return cls.__dict__["_encoding_table"]
+        except KeyError:
+            cls._encoding_table = _EncodingTable(cls.encode_char)
+            return cls._encoding_table
 
     @classmethod
     def get_non_compatible_characters(cls, content):
@@ -36,6 +68,8 @@ class SanitiseText:
 
         This follows the same rules as `cls.encode`, but returns just the characters that encode would replace with `?`
         """
+        if cls.is_fully_compatible(content):
+            return set()
         return set(
             c
             for c in content
@@ -308,3 +342,27 @@ class SanitiseASCII(SanitiseText):
         " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ"
         + "[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
     )
+
+    @classmethod
+    def is_fully_compatible(cls, content):
+        return content.isascii() and super().is_fully_compatible(content)
+
+
+class _EncodingTable(dict):
+    """
+    A table for `str.translate` which works out how to encode each character
+    the first time it’s seen. Up to `max_size` characters are remembered,
+    which is enough for every character in the Basic Multilingual Plane.
+    """
+
+    max_size = 65_536
+
+    def __init__(self, encode_char):
+        super().__init__()
+        self.encode_char = encode_char
+
+    def __missing__(self, codepoint):
+        encoded = self.encode_char(chr(codepoint))
+        if len(self) < self.max_size:
+            self[codepoint] = encoded
+        return encoded
@@ -1,8 +1,11 @@
+import json
 import math
 import re
 from abc import ABC, abstractmethod
+from collections import namedtuple
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
+from hashlib import sha256
 from html import unescape
 from os import path
 
@@ -15,8 +18,9 @@ from notifications_utils import (
     SMS_CHAR_COUNT_LIMIT,
 )
 from notifications_utils.countries.data import Postage
-from notifications_utils.field import Field, PlainTextField
+from notifications_utils.field import Field, PlainTextField, compile_content
 from notifications_utils.formatters import (
+    OBSCURE_ZERO_WIDTH_WHITESPACE,
     add_prefix,
     add_trailing_newline,
     autolink_urls,
@@ -25,6 +29,7 @@ from notifications_utils.formatters import (
     make_quotes_smart,
     nl2br,
     normalise_multiple_newlines,
+    normalise_sms,
     normalise_whitespace,
     normalise_whitespace_and_newlines,
     remove_smart_quotes_from_email_addresses,
@@ -35,6 +40,7 @@ from notifications_utils.formatters import (
     strip_leading_whitespace,
     strip_unsupported_characters,
     unlink_govuk_escaped,
+    whitespace_before_punctuation,
 )
 from notifications_utils.insensitive_dict import InsensitiveDict
 from notifications_utils.markdown import (
@@ -43,12 +49,12 @@ from notifications_utils.markdown import (
     notify_letter_preview_markdown,
     notify_plain_text_email_markdown,
 )
+from notifications_utils.pipeline import Pipeline
 from notifications_utils.postal_address import (
     PostalAddress,
     address_lines_1_to_7_keys,
 )
 from notifications_utils.sanitise_text import SanitiseSMS
-from notifications_utils.take import Take
 from notifications_utils.template_change import TemplateChange
 
 template_env = Environment(
@@ -62,8 +68,33 @@ template_env = Environment(
 )
 
 
+# The characters in the GSM-7 character set
+gsm_characters = re.compile(
+    r'[\sa-zA-Z0-9_@?£!1$"¥#è?¤é%ù&ì\\ò(Ç)*:Ø+;ÄäøÆ,<LÖlöæ\-=ÑñÅß.>ÜüåÉ/§à¡¿\']+'
+)
+
+
+def _uses_render_cache(render):
+    # Goes through the template’s `render_cache`, if it has one
+    @wraps(render)
+    def __str__(self):
+        if self.render_cache is None:
+            return render(self)
+        return Markup(
+            self.render_cache.get_or_render(self.render_cache_key, lambda: render(self))
+        )
+
+    return __str__
+
+
 class Template(ABC):
     encoding = "utf-8"
+    render_cache = None
+    render_cache_options = ()
+    # Whether `str(template)` reads values which aren’t for placeholders,
+    # like the recipient’s phone number or address
+    _renders_values_not_in_placeholders = False
+    _placeholder_keys_cache = None
 
     def __init__(
         self,
@@ -116,21 +147,56 @@ class Template(ABC):
     def values(self, value):
         if not value:
             self._values = {}
-        else:
-            placeholders = InsensitiveDict.from_keys(self.placeholders)
-            self._values = InsensitiveDict(value).as_dict_with_keys(
-                self.placeholders
-                | set(
-                    key
-                    for key in value.keys()
-                    if InsensitiveDict.make_key(key) not in placeholders.keys()
-                )
-            )
+            return
+
+        placeholder_keys, keys_of_placeholders = self._placeholder_keys
+        make_key = InsensitiveDict.make_key
+        # Like an `InsensitiveDict`, the last of any keys which normalise
+        # to the same thing wins
+        value_by_key = {make_key(key): item for key, item in value.items()}
+        values = {
+            placeholder: value_by_key.get(key) for placeholder, key in placeholder_keys
+        }
+        # Keep anything which isn’t for a placeholder too
+        values.update(
+            (key, value_by_key[make_key(key)])
+            for key in value
+            if make_key(key) not in keys_of_placeholders
+        )
+        self._values = values
 
     @property
     def placeholders(self):
         return get_placeholders(self.content)
 
+    @property
+    def _placeholder_keys(self):
+        """
+        Pairs of each placeholder and its normalised key, and the set of
+        those keys. Worked out once, so that binding values to the template
+        for each row of a spreadsheet doesn’t need to find the placeholders
+        again, unless the text they come from has changed.
+        """
+        # Everything any type of template gets its placeholders from
+        placeholders_from = (
+            self.content,
+            getattr(self, "_subject", None),
+            getattr(self, "contact_block", None),
+        )
+        if (
+            self._placeholder_keys_cache is None
+            or self._placeholder_keys_cache[0] != placeholders_from
+        ):
+            placeholder_keys = tuple(
+                (placeholder, InsensitiveDict.make_key(placeholder))
+                for placeholder in self.placeholders
+            )
+            self._placeholder_keys_cache = placeholders_from, (
+                placeholder_keys,
+                frozenset(key for _, key in placeholder_keys),
+            )
+        return self._placeholder_keys_cache[1]
+
     @property
     def missing_data(self):
         return list(
@@ -168,6 +234,52 @@ class Template(ABC):
     def is_message_too_long(self):
         return False
 
+    @property
+    def render_cache_key(self):
+        """
+        Identifies what `str(template)` renders: the kind of template, its
+        content and subject, the options named in `render_cache_options`
+        and the values.
+        """
+        return "template-render-{}".format(
+            sha256(
+                json.dumps(
+                    [
+                        self.__class__.__name__,
+                        self.template_type,
+                        self.content,
+                        getattr(self, "_subject", None),
+                        {
+                            option: getattr(self, option)
+                            for option in self.render_cache_options
+                        },
+                        self.values,
+                    ],
+                    sort_keys=True,
+                    default=str,
+                ).encode("utf-8")
+            ).hexdigest()
+        )
+
+    def render_each(self, personalisations):
+        """
+        Yields this template rendered with each of `personalisations`, the
+        same as `str(template)` would be with those values. A message is
+        only rendered once for each distinct set of the values it reads.
+        """
+        original_values = self.values
+        render = _RenderedForEachValue(
+            self,
+            None if self._renders_values_not_in_placeholders else self.placeholders,
+            self.__str__,
+        )
+        try:
+            for values in personalisations:
+                self.values = values
+                yield render()
+        finally:
+            self.values = original_values
+
 
 class BaseSMSTemplate(Template):
     template_type = "sms"
@@ -233,7 +345,10 @@ class BaseSMSTemplate(Template):
         as in the message `foo ((placeholder))` has a length of 19.
         """
         if self._content_count is None:
-            self._content_count = len(self._get_unsanitised_content())
+            counts = self._count_without_rendering()
+            self._content_count = (
+                counts.length if counts else len(self._get_unsanitised_content())
+            )
         return self._content_count
 
     @property
@@ -254,20 +369,14 @@ class BaseSMSTemplate(Template):
         Since we are supporting more or less "all" languages, it doesn't seem like we really want to count chars,
         and that counting bytes should suffice.
         """
-
-        # check if all chars are in the GSM-7 character set
-        def gsm_check(x):
-            rule = re.compile(
-                r'^[\sa-zA-Z0-9_@?£!1$"¥#è?¤é%ù&ì\\ò(Ç)*:Ø+;ÄäøÆ,<LÖlöæ\-=ÑñÅß.>ÜüåÉ/§à¡¿\']+$'
-            )
-            gsm_match = rule.search(x)
-            if gsm_match is None:
-                return False
-            return True
-
-        message_str = self.content_with_placeholders_filled_in
-
-        content_len = len(message_str)
+        counts = self._count_without_rendering()
+        if counts:
+            content_len, is_gsm = counts.encoded_length, counts.gsm
+        else:
+            message_str = self.content_with_placeholders_filled_in
+            content_len = len(message_str)
+            # check if all chars are in the GSM-7 character set
+            is_gsm = bool(message_str) and gsm_characters.fullmatch(message_str)
 
         """
         Checks for GSM-7 char set, calculates msg size, and
@@ -277,7 +386,7 @@ class BaseSMSTemplate(Template):
 
         Calculations are based on https://messente.com/documentation/tools/sms-length-calculator
         """
-        if gsm_check(message_str):
+        if is_gsm:
             if content_len <= 160:
                 return math.ceil(content_len / 160)
             else:
@@ -300,6 +409,14 @@ class BaseSMSTemplate(Template):
     def is_message_empty(self):
         return self.content_count_without_prefix == 0
 
+    def _count_without_rendering(self):
+        # Returns `None` if the message has to be rendered to be counted
+        if not self.values:
+            return None
+        return _get_sms_counter(self.content, self.prefix).count(
+            PlainTextField(self.content, self.values, html="passthrough")
+        )
+
     def _get_unsanitised_content(self):
         # This is faster to call than SMSMessageTemplate.__str__ if all
         # you need to know is how many characters are in the message
@@ -307,15 +424,10 @@ class BaseSMSTemplate(Template):
             values = self.values
         else:
             values = {key: MAGIC_SEQUENCE for key in self.placeholders}
-        return (
-            Take(PlainTextField(self.content, values, html="passthrough"))
-            .then(add_prefix, self.prefix)
-            .then(remove_whitespace_before_punctuation)
-            .then(normalise_whitespace_and_newlines)
-            .then(normalise_multiple_newlines)
-            .then(str.strip)
-            .then(str.replace, MAGIC_SEQUENCE, "")
-        )
+        return normalise_sms(
+            str(PlainTextField(self.content, values, html="passthrough")),
+            self.prefix,
+        ).replace(MAGIC_SEQUENCE, "")
 
 
 class SMSMessageTemplate(BaseSMSTemplate):
@@ -333,7 +445,13 @@ class SMSBodyPreviewTemplate(BaseSMSTemplate):
 
     def __str__(self):
         return Markup(
-            Take(
+            Pipeline(
+                sms_encode,
+                remove_whitespace_before_punctuation,
+                normalise_whitespace_and_newlines,
+                normalise_multiple_newlines,
+                str.strip,
+            )(
                 Field(
                     self.content,
                     self.values,
@@ -341,16 +459,20 @@ class SMSBodyPreviewTemplate(BaseSMSTemplate):
                     redact_missing_personalisation=True,
                 )
             )
-            .then(sms_encode)
-            .then(remove_whitespace_before_punctuation)
-            .then(normalise_whitespace_and_newlines)
-            .then(normalise_multiple_newlines)
-            .then(str.strip)
         )
 
 
 class SMSPreviewTemplate(BaseSMSTemplate):
     jinja_template = template_env.get_template("sms_preview_template.jinja2")
+    _renders_values_not_in_placeholders = True
+    render_cache_options = (
+        "prefix",
+        "sender",
+        "show_recipient",
+        "show_sender",
+        "downgrade_non_sms_characters",
+        "redact_missing_personalisation",
+    )
 
     def __init__(
         self,
@@ -370,6 +492,7 @@ class SMSPreviewTemplate(BaseSMSTemplate):
         super().__init__(template, values, prefix, show_prefix, sender)
         self.redact_missing_personalisation = redact_missing_personalisation
 
+    @_uses_render_cache
     def __str__(self):
         return Markup(
             self.jinja_template.render(
@@ -383,29 +506,30 @@ class SMSPreviewTemplate(BaseSMSTemplate):
                         html="escape",
                     ),
                     "show_recipient": self.show_recipient,
-                    "body": Take(
-                        Field(
-                            self.content,
-                            self.values,
-                            html="escape",
-                            redact_missing_personalisation=self.redact_missing_personalisation,
-                        )
-                    )
-                    .then(
-                        add_prefix,
-                        (
-                            (escape_html(self.prefix) or None)
-                            if self.show_prefix
-                            else None
+                    "body": autolink_urls(
+                        Pipeline(
+                            sms_encode if self.downgrade_non_sms_characters else str,
+                            remove_whitespace_before_punctuation,
+                            normalise_whitespace_and_newlines,
+                            normalise_multiple_newlines,
+                            nl2br,
+                        )(
+                            add_prefix(
+                                str(
+                                    Field(
+                                        self.content,
+                                        self.values,
+                                        html="escape",
+                                        redact_missing_personalisation=self.redact_missing_personalisation,
+                                    )
+                                ),
+                                (
+                                    (escape_html(self.prefix) or None)
+                                    if self.show_prefix
+                                    else None
+                                ),
+                            )
                         ),
-                    )
-                    .then(sms_encode if self.downgrade_non_sms_characters else str)
-                    .then(remove_whitespace_before_punctuation)
-                    .then(normalise_whitespace_and_newlines)
-                    .then(normalise_multiple_newlines)
-                    .then(nl2br)
-                    .then(
-                        autolink_urls,
                         classes="govuk-link govuk-link--no-visited-state",
                     ),
                 }
@@ -465,18 +589,17 @@ class BroadcastMessageTemplate(BaseBroadcastTemplate, SMSMessageTemplate):
         return cls.from_content(broadcast_event["transmitted_content"]["body"])
 
     def __str__(self):
-        return (
-            Take(
-                Field(
-                    self.content.strip(),
-                    self.values,
-                    html="escape",
-                )
+        return Pipeline(
+            sms_encode,
+            remove_whitespace_before_punctuation,
+            normalise_whitespace_and_newlines,
+            normalise_multiple_newlines,
+        )(
+            Field(
+                self.content.strip(),
+                self.values,
+                html="escape",
             )
-            .then(sms_encode)
-            .then(remove_whitespace_before_punctuation)
-            .then(normalise_whitespace_and_newlines)
-            .then(normalise_multiple_newlines)
         )
 
 
@@ -488,7 +611,7 @@ class SubjectMixin:
     @property
     def subject(self):
         return Markup(
-            Take(
+            Pipeline(do_nice_typography, normalise_whitespace)(
                 Field(
                     self._subject,
                     self.values,
@@ -496,8 +619,6 @@ class SubjectMixin:
                     redact_missing_personalisation=self.redact_missing_personalisation,
                 )
             )
-            .then(do_nice_typography)
-            .then(normalise_whitespace)
         )
 
     @property
@@ -510,21 +631,51 @@ class BaseEmailTemplate(SubjectMixin, Template):
 
     @property
     def html_body(self):
-        return (
-            Take(
+        return self._html_body_from(
+            self._get_markdown(
+                html="escape",
+                redact_missing_personalisation=self.redact_missing_personalisation,
+            )
+        )
+
+    def _get_markdown(self, html, **kwargs):
+        return self._prepare_markdown(
+            Field(self.content, self.values, html=html, markdown_lists=True, **kwargs)
+        )
+
+    @staticmethod
+    def _prepare_markdown(content):
+        return Pipeline(
+            unlink_govuk_escaped,
+            strip_unsupported_characters,
+            add_trailing_newline,
+        )(content)
+
+    @staticmethod
+    def _html_body_from(markdown):
+        return Pipeline(notify_email_markdown, do_nice_typography)(markdown)
+
+    @staticmethod
+    def _plain_text_from(markdown):
+        return Pipeline(
+            notify_plain_text_email_markdown,
+            do_nice_typography,
+            unescape,
+            strip_leading_whitespace,
+            add_trailing_newline,
+        )(markdown)
+
+    @property
+    def _plain_text_subject(self):
+        return Markup(
+            Pipeline(do_nice_typography, normalise_whitespace)(
                 Field(
-                    self.content,
+                    self._subject,
                     self.values,
-                    html="escape",
-                    markdown_lists=True,
+                    html="passthrough",
                     redact_missing_personalisation=self.redact_missing_personalisation,
                 )
             )
-            .then(unlink_govuk_escaped)
-            .then(strip_unsupported_characters)
-            .then(add_trailing_newline)
-            .then(notify_email_markdown)
-            .then(do_nice_typography)
         )
 
     @property
@@ -567,40 +718,16 @@ class BaseEmailTemplate(SubjectMixin, Template):
 
 class PlainTextEmailTemplate(BaseEmailTemplate):
     def __str__(self):
-        return (
-            Take(
-                Field(
-                    self.content, self.values, html="passthrough", markdown_lists=True
-                )
-            )
-            .then(unlink_govuk_escaped)
-            .then(strip_unsupported_characters)
-            .then(add_trailing_newline)
-            .then(notify_plain_text_email_markdown)
-            .then(do_nice_typography)
-            .then(unescape)
-            .then(strip_leading_whitespace)
-            .then(add_trailing_newline)
-        )
+        return self._plain_text_from(self._get_markdown(html="passthrough"))
 
     @property
     def subject(self):
-        return Markup(
-            Take(
-                Field(
-                    self._subject,
-                    self.values,
-                    html="passthrough",
-                    redact_missing_personalisation=self.redact_missing_personalisation,
-                )
-            )
-            .then(do_nice_typography)
-            .then(normalise_whitespace)
-        )
+        return self._plain_text_subject
 
 
 class HTMLEmailTemplate(BaseEmailTemplate):
     jinja_template = template_env.get_template("email_template.jinja2")
+    _render_bundle = None
 
     PREHEADER_LENGTH_IN_CHARACTERS = 256
 
@@ -627,42 +754,142 @@ class HTMLEmailTemplate(BaseEmailTemplate):
 
     @property
     def preheader(self):
+        return self._preheader_from(self._get_markdown(html="escape"))
+
+    def _preheader_from(self, markdown):
         return " ".join(
-            Take(
+            Pipeline(notify_email_preheader_markdown, do_nice_typography)(
+                markdown
+            ).split()
+        )[: self.PREHEADER_LENGTH_IN_CHARACTERS].strip()
+
+    def __str__(self):
+        return self._render(self.subject, self.html_body, self.preheader)
+
+    def _render(self, subject, html_body, preheader):
+        return self.jinja_template.render(
+            {
+                "subject": subject,
+                "body": html_body,
+                "preheader": preheader,
+                **self._branding,
+            }
+        )
+
+    def render_bundle(self):
+        """
+        Returns an `EmailRenderBundle` of everything needed to send this
+        email. The content is only filled in and prepared for markdown once
+        for each of HTML and plain text, and the bundle is remembered until
+        the content, subject, values or branding change.
+        """
+        # A copy of the values, so that changing them in place is noticed
+        rendered_from = (
+            self.content,
+            self._subject,
+            dict(self.values),
+            self.redact_missing_personalisation,
+            self._branding,
+        )
+        if self._render_bundle is None or self._render_bundle[0] != rendered_from:
+            escaped_markdown = self._get_markdown(html="escape")
+            filled_in = str(
                 Field(
                     self.content,
                     self.values,
-                    html="escape",
+                    html="passthrough",
                     markdown_lists=True,
                 )
             )
-            .then(unlink_govuk_escaped)
-            .then(strip_unsupported_characters)
-            .then(add_trailing_newline)
-            .then(notify_email_preheader_markdown)
-            .then(do_nice_typography)
-            .split()
-        )[: self.PREHEADER_LENGTH_IN_CHARACTERS].strip()
+            html_body = self._html_body_from(escaped_markdown)
+            preheader = self._preheader_from(escaped_markdown)
+            bundle = EmailRenderBundle(
+                subject=self._plain_text_subject,
+                html=self._render(self.subject, html_body, preheader),
+                plain_text=self._plain_text_from(self._prepare_markdown(filled_in)),
+                preheader=preheader,
+                content_size_in_bytes=len(filled_in.strip().encode("utf8")),
+            )
+            self._render_bundle = rendered_from, bundle
+        return self._render_bundle[1]
 
-    def __str__(self):
-        return self.jinja_template.render(
-            {
-                "subject": self.subject,
-                "body": self.html_body,
-                "preheader": self.preheader,
-                "govuk_banner": self.govuk_banner,
-                "complete_html": self.complete_html,
-                "brand_logo": self.brand_logo,
-                "brand_text": self.brand_text,
-                "brand_colour": self.brand_colour,
-                "brand_banner": self.brand_banner,
-                "brand_name": self.brand_name,
-            }
+    @property
+    def _branding(self):
+        return {
+            "govuk_banner": self.govuk_banner,
+            "complete_html": self.complete_html,
+            "brand_logo": self.brand_logo,
+            "brand_text": self.brand_text,
+            "brand_colour": self.brand_colour,
+            "brand_banner": self.brand_banner,
+            "brand_name": self.brand_name,
+        }
+
+    def render_each(self, personalisations):
+        # The layout doesn’t depend on personalisation, so it’s rendered
+        # once and split around the parts of the email which do
+        parts = {
+            "subject": _RenderedForEachValue(
+                self, get_placeholders(self._subject), lambda: self.subject
+            ),
+            "body": _RenderedForEachValue(
+                self, get_placeholders(self.content), lambda: self.html_body
+            ),
+            "preheader": _RenderedForEachValue(
+                self, get_placeholders(self.content), lambda: self.preheader
+            ),
+        }
+        markers = {f"{MAGIC_SEQUENCE}{part}{MAGIC_SEQUENCE}": part for part in parts}
+        layout = re.split(
+            "({})".format("|".join(markers)),
+            self.jinja_template.render(
+                {part: marker for marker, part in markers.items()} | self._branding
+            ),
         )
+        # Every other item is a marker, starting with the second one
+        layout = [
+            markers[item] if position % 2 else item
+            for position, item in enumerate(layout)
+        ]
+
+        original_values = self.values
+        try:
+            for values in personalisations:
+                self.values = values
+                rendered_parts = {part: render() for part, render in parts.items()}
+                yield "".join(
+                    rendered_parts[item] if position % 2 else item
+                    for position, item in enumerate(layout)
+                )
+        finally:
+            self.values = original_values
+
+
+class EmailRenderBundle(
+    namedtuple(
+        "EmailRenderBundle",
+        ["subject", "html", "plain_text", "preheader", "content_size_in_bytes"],
+    )
+):
+    """
+    The same as the `subject` and `str` of a `PlainTextEmailTemplate`, and
+    the `str`, `preheader` and `content_size_in_bytes` of an
+    `HTMLEmailTemplate`, for the same template and values.
+    """
+
+    __slots__ = ()
 
 
 class EmailPreviewTemplate(BaseEmailTemplate):
     jinja_template = template_env.get_template("email_preview_template.jinja2")
+    _renders_values_not_in_placeholders = True
+    render_cache_options = (
+        "from_name",
+        "from_address",
+        "reply_to",
+        "show_recipient",
+        "redact_missing_personalisation",
+    )
 
     def __init__(
         self,
@@ -684,6 +911,7 @@ class EmailPreviewTemplate(BaseEmailTemplate):
         self.reply_to = reply_to
         self.show_recipient = show_recipient
 
+    @_uses_render_cache
     def __str__(self):
         return Markup(
             self.jinja_template.render(
@@ -703,22 +931,19 @@ class EmailPreviewTemplate(BaseEmailTemplate):
 
     @property
     def subject(self):
-        return (
-            Take(
-                Field(
-                    self._subject,
-                    self.values,
-                    html="escape",
-                    redact_missing_personalisation=self.redact_missing_personalisation,
-                )
+        return Pipeline(do_nice_typography, normalise_whitespace)(
+            Field(
+                self._subject,
+                self.values,
+                html="escape",
+                redact_missing_personalisation=self.redact_missing_personalisation,
             )
-            .then(do_nice_typography)
-            .then(normalise_whitespace)
         )
 
 
 class BaseLetterTemplate(SubjectMixin, Template):
     template_type = "letter"
+    _renders_values_not_in_placeholders = True
 
     address_block = "\n".join(
         f'(({line.replace("_", " ")}))' for line in address_lines_1_to_7_keys
@@ -746,17 +971,13 @@ class BaseLetterTemplate(SubjectMixin, Template):
 
     @property
     def subject(self):
-        return (
-            Take(
-                Field(
-                    self._subject,
-                    self.values,
-                    redact_missing_personalisation=self.redact_missing_personalisation,
-                    html="escape",
-                )
+        return Pipeline(do_nice_typography, normalise_whitespace)(
+            Field(
+                self._subject,
+                self.values,
+                redact_missing_personalisation=self.redact_missing_personalisation,
+                html="escape",
             )
-            .then(do_nice_typography)
-            .then(normalise_whitespace)
         )
 
     @property
@@ -787,17 +1008,13 @@ class BaseLetterTemplate(SubjectMixin, Template):
 
     @property
     def _contact_block(self):
-        return (
-            Take(
-                Field(
-                    "\n".join(line.strip() for line in self.contact_block.split("\n")),
-                    self.values,
-                    redact_missing_personalisation=self.redact_missing_personalisation,
-                    html="escape",
-                )
+        return Pipeline(remove_whitespace_before_punctuation, nl2br)(
+            Field(
+                "\n".join(line.strip() for line in self.contact_block.split("\n")),
+                self.values,
+                redact_missing_personalisation=self.redact_missing_personalisation,
+                html="escape",
             )
-            .then(remove_whitespace_before_punctuation)
-            .then(nl2br)
         )
 
     @property
@@ -806,26 +1023,33 @@ class BaseLetterTemplate(SubjectMixin, Template):
 
     @property
     def _message(self):
-        return (
-            Take(
-                Field(
-                    self.content,
-                    self.values,
-                    html="escape",
-                    markdown_lists=True,
-                    redact_missing_personalisation=self.redact_missing_personalisation,
-                )
+        return Pipeline(
+            add_trailing_newline,
+            notify_letter_preview_markdown,
+            do_nice_typography,
+            replace_hyphens_with_non_breaking_hyphens,
+        )(
+            Field(
+                self.content,
+                self.values,
+                html="escape",
+                markdown_lists=True,
+                redact_missing_personalisation=self.redact_missing_personalisation,
             )
-            .then(add_trailing_newline)
-            .then(notify_letter_preview_markdown)
-            .then(do_nice_typography)
-            .then(replace_hyphens_with_non_breaking_hyphens)
         )
 
 
 class LetterPreviewTemplate(BaseLetterTemplate):
     jinja_template = template_env.get_template("letter_pdf/preview.jinja2")
+    render_cache_options = (
+        "contact_block",
+        "admin_base_url",
+        "logo_file_name",
+        "redact_missing_personalisation",
+        "_date",
+    )
 
+    @_uses_render_cache
     def __str__(self):
         return Markup(
             self.jinja_template.render(
@@ -955,7 +1179,10 @@ def non_gsm_characters(content):
     emoji, ellipsis, ñ, etc). This only includes welsh non gsm characters that will force the entire SMS to be encoded
     with UCS-2.
     """
-    return set(content) & set(SanitiseSMS.WELSH_NON_GSM_CHARACTERS)
+    if content.isascii():
+        # None of them are ASCII
+        return set()
+    return set(content) & SanitiseSMS.WELSH_NON_GSM_CHARACTERS
 
 
 def count_extended_gsm_chars(content):
@@ -963,15 +1190,187 @@ def count_extended_gsm_chars(content):
 
 
 def do_nice_typography(value):
-    return (
-        Take(value)
-        .then(remove_whitespace_before_punctuation)
-        .then(make_quotes_smart)
-        .then(remove_smart_quotes_from_email_addresses)
-        .then(replace_hyphens_with_en_dashes)
-    )
+    return Pipeline(
+        remove_whitespace_before_punctuation,
+        make_quotes_smart,
+        remove_smart_quotes_from_email_addresses,
+        replace_hyphens_with_en_dashes,
+    )(value)
 
 
 @lru_cache(maxsize=1024)
 def get_placeholders(content):
     return Field(content).placeholders
+
+
+def render_many(template, personalisations, template_class=None, **kwargs):
+    """
+    Renders the `template` dictionary once for each of `personalisations`,
+    yielding the same output as creating a template with each one and
+    calling `str` on it. Work which doesn’t depend on personalisation is
+    only done once. Uses `SMSMessageTemplate` or `HTMLEmailTemplate`
+    unless another `template_class` is given, and passes it `kwargs`.
+    """
+    if template_class is None:
+        template_class = {
+            "sms": SMSMessageTemplate,
+            "email": HTMLEmailTemplate,
+        }[template["template_type"]]
+    return template_class(template, **kwargs).render_each(personalisations)
+
+
+class _RenderedForEachValue:
+    """
+    Calls `render` when the template’s values for `keys`, or all of its
+    values if `keys` is `None`, are ones it hasn’t seen, and otherwise
+    returns what it rendered last time. Up to `max_size` sets of values are
+    remembered at once.
+
+    If most of the first `values_to_sample` sets of values are different,
+    for example because every recipient has their own name, looking them
+    up costs more than it saves, so it stops remembering them.
+    """
+
+    max_size = 1_000
+    values_to_sample = 100
+
+    def __init__(self, template, keys, render):
+        self.template = template
+        self.keys = keys
+        self.render = render
+        self.rendered = {}
+        self.count_of_repeated_values = 0
+
+    def __call__(self):
+        if self.rendered is None:
+            return self.render()
+        # Values like `1` and `True` are equal but render differently
+        if self.keys is None:
+            key = tuple(
+                (name, type(value), value)
+                for name, value in self.template.values.items()
+            )
+        else:
+            key = tuple(
+                (type(value), value)
+                for value in map(self.template.values.get, self.keys)
+            )
+        try:
+            rendered = self.rendered[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Some values, like lists, can’t be used as a key
+            return self.render()
+        else:
+            self.count_of_repeated_values += 1
+            return rendered
+        if len(self.rendered) == self.values_to_sample and (
+            self.count_of_repeated_values < self.values_to_sample
+        ):
+            self.rendered = None
+            return self.render()
+        if len(self.rendered) >= self.max_size:
+            self.rendered.clear()
+        rendered = self.rendered[key] = self.render()
+        return rendered
+
+
+class _SMSCounts(namedtuple("_SMSCounts", ["length", "encoded_length", "gsm"])):
+    """
+    The number of characters in an SMS before and after it’s encoded, and
+    whether the encoded message only uses the GSM-7 character set.
+    """
+
+    __slots__ = ()
+
+
+class _SMSCounter:
+    """
+    Counts the characters in an SMS without rendering it. The content
+    around the placeholders is normalised and measured once, and the count
+    for a message is that plus the length of each value.
+
+    This only works when a value would come through normalisation
+    unchanged wherever it is in the message, so `count` returns `None` for
+    any other values.
+    """
+
+    # A private use character, which is normalised like a single word
+    marker = "\uE000"
+
+    def __init__(self, content, prefix):
+        self.placeholders = ()
+        self.static_counts = None
+
+        if self.marker in content or (prefix and self.marker in prefix):
+            return
+
+        compiled = compile_content(content, Field.placeholder_pattern, str)
+        placeholders = tuple(part for part in compiled if not isinstance(part, str))
+        static_parts = (
+            normalise_sms(
+                "".join(
+                    part if isinstance(part, str) else self.marker for part in compiled
+                ),
+                prefix,
+            )
+            .replace(MAGIC_SEQUENCE, "")
+            .split(self.marker)
+        )
+
+        if len(static_parts) != len(placeholders) + 1:
+            return
+
+        self.placeholders = placeholders
+        self.static_counts = _measure_sms_text("".join(static_parts))
+
+    def count(self, field):
+        if self.static_counts is None:
+            return None
+
+        length, encoded_length, gsm = self.static_counts
+        for placeholder in self.placeholders:
+            value_counts = _measure_sms_value(field._replace_placeholder(placeholder))
+            if value_counts is None:
+                return None
+            length += value_counts.length
+            encoded_length += value_counts.encoded_length
+            gsm = gsm and value_counts.gsm
+        return _SMSCounts(length, encoded_length, gsm)
+
+
+def _measure_sms_text(text):
+    encoded = sms_encode(text)
+    return _SMSCounts(
+        len(text),
+        len(encoded),
+        not encoded or gsm_characters.fullmatch(encoded) is not None,
+    )
+
+
+_magic_sequence_characters = frozenset(MAGIC_SEQUENCE)
+_obscure_zero_width_whitespace = frozenset(OBSCURE_ZERO_WIDTH_WHITESPACE)
+
+
+@lru_cache(maxsize=10_000)
+def _measure_sms_value(value):
+    # Values with whitespace at either end, more than one space in a row,
+    # line breaks or other whitespace, punctuation which could have
+    # whitespace removed before it, or characters which are removed from
+    # the message could change the content around them when normalised
+    if (
+        not value
+        or value != " ".join(value.split())
+        or value[0] in ",."
+        or whitespace_before_punctuation.search(value)
+        or not _magic_sequence_characters.isdisjoint(value)
+        or not _obscure_zero_width_whitespace.isdisjoint(value)
+    ):
+        return None
+    return _measure_sms_text(value)
+
+
+@lru_cache(maxsize=1024)
+def _get_sms_counter(content, prefix):
+    return _SMSCounter(content, prefix)
@@ -0,0 +1,62 @@
+import pytest
+from markupsafe import Markup
+
+from notifications_utils.clients.redis import RedisRenderCache
+from notifications_utils.clients.redis.redis_client import RedisClient
+from notifications_utils.template import EmailPreviewTemplate
+
+
+@pytest.fixture(scope="function")
+def mocked_redis_client(app):
+    app.config["REDIS_ENABLED"] = True
+    redis_client = RedisClient()
+    redis_client.init_app(app)
+    return redis_client
+
+
+@pytest.fixture
+def cache(mocked_redis_client):
+    return RedisRenderCache(mocked_redis_client)
+
+
+def test_render_cache_stores_rendered_template(mocker, mocked_redis_client, cache):
+    mock_redis_get = mocker.patch.object(mocked_redis_client, "get", return_value=None)
+    mock_redis_set = mocker.patch.object(mocked_redis_client, "set")
+    template = EmailPreviewTemplate(
+        {"template_type": "email", "subject": "Hi", "content": "Hello ((name))"},
+        {"name": "Jo"},
+    )
+    template.render_cache = cache
+
+    rendered = str(template)
+
+    assert "Hello Jo" in rendered
+    mock_redis_get.assert_called_once_with(template.render_cache_key)
+    mock_redis_set.assert_called_once_with(
+        template.render_cache_key, rendered, ex=86_400
+    )
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_render_cache_returns_cached_template(mocker, mocked_redis_client, cache):
+    mocker.patch.object(
+        mocked_redis_client, "get", return_value="<p>Cached ’</p>".encode("utf-8")
+    )
+    mock_redis_set = mocker.patch.object(mocked_redis_client, "set")
+    template = EmailPreviewTemplate(
+        {"template_type": "email", "subject": "Hi", "content": "Hello"},
+    )
+    template.render_cache = cache
+
+    assert str(template) == Markup("<p>Cached ’</p>")
+    assert isinstance(str(template), Markup)
+    assert mock_redis_set.called is False
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_render_cache_uses_ttl(mocker, mocked_redis_client):
+    mock_redis_set = mocker.patch.object(mocked_redis_client, "set")
+
+    RedisRenderCache(mocked_redis_client, ttl_in_seconds=60).set("key", "rendered")
+
+    mock_redis_set.assert_called_once_with("key", "rendered", ex=60)
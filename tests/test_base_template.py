@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
+from notifications_utils.field import Field
 from notifications_utils.template import SubjectMixin, Template
 
 
@@ -79,6 +80,63 @@ def test_matches_keys_to_placeholder_names():
     assert template.missing_data == ["name"]
 
 
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ({}, {}),
+        ({"Name": "Chris"}, {"name": "Chris", "first_name": None, "Subject": None}),
+        (
+            {"FIRST NAME": "Chris", "first-name": "Kris", "subject": 1},
+            {"name": None, "first_name": "Kris", "Subject": 1},
+        ),
+        (
+            {"town": "London", "TOWN": "Paris", "Other": None},
+            {
+                "name": None,
+                "first_name": None,
+                "Subject": None,
+                "town": "Paris",
+                "TOWN": "Paris",
+                "Other": None,
+            },
+        ),
+    ],
+)
+def test_values_are_bound_to_placeholders(values, expected):
+    template = ConcreteTemplateWithSubject(
+        {"content": "((name)) ((first_name))", "subject": "((Subject))"}
+    )
+    template.values = values
+    assert template.values == expected
+
+
+def test_binding_values_only_finds_placeholders_once(mocker):
+    template = ConcreteTemplateWithSubject(
+        {"content": "hello ((name))", "subject": "((greeting))"}
+    )
+    get_placeholders = mocker.patch(
+        "notifications_utils.template.get_placeholders",
+        side_effect=lambda content: Field(content).placeholders,
+    )
+
+    for name in ("Chris", "Kris", "Cris"):
+        template.values = {"name": name, "Greeting": "Hi"}
+
+    assert template.values == {"name": "Cris", "greeting": "Hi"}
+    assert get_placeholders.call_count == 2
+
+    template.content = "bye ((town))"
+    template.values = {"town": "London"}
+
+    assert template.values == {"town": "London", "greeting": None}
+    assert get_placeholders.call_count == 4
+
+    template._subject = "((farewell))"
+    template.values = {"town": "Paris"}
+
+    assert template.values == {"town": "Paris", "farewell": None}
+
+
 @pytest.mark.parametrize(
     "template_content, template_subject, expected",
     [
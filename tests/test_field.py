@@ -1,6 +1,12 @@
 import pytest
 
-from notifications_utils.field import Field, str2bool
+from notifications_utils.field import (
+    CompiledPlaceholder,
+    Field,
+    PlainTextField,
+    compile_content,
+    str2bool,
+)
 
 
 @pytest.mark.parametrize(
@@ -309,3 +315,40 @@ def test_field_renders_lists_as_strings(values, expected, expected_as_markdown):
         == expected_as_markdown
     )
     assert str(Field("list: ((placeholder))", values)) == expected
+
+
+def test_compile_content_splits_content_into_literals_and_placeholders():
+    assert compile_content(
+        "<b>Hi</b> ((First_Name)), ((Show ?? see ((you)) soon))((x??))",
+        Field.placeholder_pattern,
+        str,
+    ) == (
+        "<b>Hi</b> ",
+        CompiledPlaceholder(name="First_Name", conditional_text=None, key="firstname"),
+        ", ((Show ?? see ",
+        CompiledPlaceholder(name="you", conditional_text=None, key="you"),
+        " soon))",
+        CompiledPlaceholder(name="x", conditional_text="", key="x"),
+    )
+
+
+def test_compile_content_sanitises_content():
+    assert compile_content("<b>Hi</b> ((name))", Field.placeholder_pattern, str) == (
+        "<b>Hi</b> ",
+        CompiledPlaceholder(name="name", conditional_text=None, key="name"),
+    )
+    assert Field("<b>Hi</b> ((name))")._compiled_content == (
+        "Hi ",
+        CompiledPlaceholder(name="name", conditional_text=None, key="name"),
+    )
+
+
+def test_fields_with_the_same_content_are_only_compiled_once():
+    compile_content.cache_clear()
+
+    for name in ("Jo", "Sam", "Alex"):
+        assert str(Field("Hi ((name))", {"name": name})) == f"Hi {name}"
+        assert str(PlainTextField("Hi ((name))", {"name": name})) == f"Hi {name}"
+
+    assert compile_content.cache_info().misses == 1
+    assert compile_content.cache_info().hits == 5
@@ -1,12 +1,20 @@
+import random
+
 import pytest
 from markupsafe import Markup
 
 from notifications_utils.formatters import (
+    add_prefix,
     autolink_urls,
+    dotted_words,
     escape_html,
+    find_urls,
     formatted_list,
     make_quotes_smart,
+    normalise_multiple_newlines,
+    normalise_sms,
     normalise_whitespace,
+    normalise_whitespace_and_newlines,
     remove_smart_quotes_from_email_addresses,
     remove_whitespace_before_punctuation,
     replace_hyphens_with_en_dashes,
@@ -15,7 +23,9 @@ from notifications_utils.formatters import (
     strip_and_remove_obscure_whitespace,
     strip_unsupported_characters,
     unlink_govuk_escaped,
+    url,
 )
+from notifications_utils.take import Take
 from notifications_utils.template import (
     HTMLEmailTemplate,
     PlainTextEmailTemplate,
@@ -435,6 +445,31 @@ def test_normalise_whitespace(value):
     assert normalise_whitespace(value) == "Your tax is due"
 
 
+@pytest.mark.parametrize(
+    "value",
+    (
+        "",
+        "\n\n",
+        "Your tax is due",
+        "  Your tax \t is due .\n\n\n\nPay now ,please\n\n",
+        "\u00A0\nYour\u00A0tax\r\n\r\n\u200B\r\nis due\u2028",
+        "Your tax\r\u200B\nis due",
+        "Line one\x0b\x0c\x85Line two \u00A0.",
+        "\u200B\n\n\n\u2060",
+    ),
+)
+@pytest.mark.parametrize("prefix", (None, "", " Service ", "."))
+def test_normalise_sms_matches_formatting_in_turn(value, prefix):
+    assert normalise_sms(value, prefix) == (
+        Take(value)
+        .then(add_prefix, prefix)
+        .then(remove_whitespace_before_punctuation)
+        .then(normalise_whitespace_and_newlines)
+        .then(normalise_multiple_newlines)
+        .then(str.strip)
+    )
+
+
 @pytest.mark.parametrize(
     "content, expected_html",
     (
@@ -575,3 +610,135 @@ def test_autolink_urls_applies_correct_attributes(extra_kwargs, expected_html):
 )
 def test_autolink_urls_returns_markup(content):
     assert isinstance(autolink_urls(content), Markup)
+
+
+_realistic_messages = (
+    "Your appointment is on Tuesday 12 March at 10:30am. Reply STOP to cancel",
+    "Your security code is 123456",
+    "Hi, your parcel will arrive today between 1pm and 3pm",
+    "Reminder: your passport expires on 1 May 2025. Renew online at "
+    "https://www.example.gov/renew",
+    "Thank you for registering. Your reference number is ABC123",
+    "Hello Jo Bloggs\n\n"
+    "Your application has been received and we will contact you within 10 "
+    "working days.\n\n"
+    "Thanks\n"
+    "The licensing team",
+    "Dear Sam,\n\n"
+    "We’ve received your payment of $120.00 for your renewal. You don’t need "
+    "to do anything else.\n\n"
+    "If you have any questions, reply to this email.\n\n"
+    "Regards\n"
+    "Customer services",
+    "# Your claim\n\n"
+    "We have approved your claim.\n\n"
+    "* Amount: $250\n"
+    "* Paid on: 3 June\n\n"
+    "^ Keep this email for your records\n\n"
+    "Contact support@example.gov if something is wrong",
+    "Hi Alex,\n\n"
+    'Your "Blue Badge" renewal - reference 1234 - has been approved. '
+    "We'll post it to you within 5 working days.\n\n"
+    "See GOV.UK for more information.",
+)
+
+_formatters_with_triggers = (
+    autolink_urls,
+    make_quotes_smart,
+    normalise_multiple_newlines,
+    remove_smart_quotes_from_email_addresses,
+    remove_whitespace_before_punctuation,
+    replace_hyphens_with_en_dashes,
+    unlink_govuk_escaped,
+)
+
+
+@pytest.mark.parametrize("formatter", _formatters_with_triggers)
+def test_formatters_with_triggers_give_same_result_as_without(formatter):
+    for message in _realistic_messages + (
+        "",
+        "nothing to change at all",
+        "Markup'll & “quotes” - and ‘email’@example.com ,\n\n\n\ngov.uk",
+    ):
+        for value in (message, Markup(message)):
+            assert formatter(value) == formatter.__wrapped__(value)
+            assert type(formatter(value)) is type(formatter.__wrapped__(value))
+
+
+@pytest.mark.parametrize("formatter", _formatters_with_triggers)
+def test_formatters_dont_change_text_without_triggers(formatter):
+    characters = list(" \t\n.,-–—'\"\\&@‘’“”#*^<>/:abcovuk" "GOVUK\u00a0\u200b\u2028é")
+    random.seed(formatter.__name__)
+    for _ in range(2000):
+        value = "".join(random.choices(characters, k=random.randint(0, 20)))
+        if any(trigger in value for trigger in formatter.triggers):
+            continue
+        assert formatter.__wrapped__(value) == value
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        "",
+        "no links here",
+        "http://example.com and https://www.example.com/path?query#fragment",
+        "example.com/foo_(bar)). and then www.example.co.uk.",
+        "first.last@example.com and @example.com and .example.com",
+        "xn--http://example.com and xn--HTTPS://K.com",
+        "a..b.com and a-.b.com and -a.com and example.com-foo.bar",
+        "go to gov.uk/foo<bar> or http://-.example",
+    ),
+)
+def test_find_urls_finds_same_matches_as_url_regex(content):
+    assert [match.span() for match in find_urls(content)] == [
+        match.span() for match in url.finditer(content)
+    ]
+
+
+def test_find_urls_finds_same_matches_as_url_regex_for_random_content():
+    fragments = list("ab-_.@/:?#< \n1é") + [
+        "http://",
+        "HTTPS://",
+        "www.",
+        ".com",
+        ".co.uk",
+        "xn--",
+        "..",
+    ]
+    random.seed(0)
+    for _ in range(5_000):
+        content = "".join(random.choices(fragments, k=random.randint(0, 40)))
+        assert [match.span() for match in find_urls(content)] == [
+            match.span() for match in url.finditer(content)
+        ], content
+
+
+@pytest.mark.parametrize(
+    "repeated",
+    (
+        "a-",  # a long tracking string
+        "a-b.",  # a long tracking string with dots
+        "abc-def-",
+        "QUJD+REVG/R0g=-",  # pasted base64
+        "a-a..",
+        "xhttp://a-",
+    ),
+)
+def test_autolink_urls_takes_linear_time_on_pathological_content(mocker, repeated):
+    content = repeated * 5_000 + "."
+    url_mock = mocker.patch("notifications_utils.formatters.url", wraps=url)
+
+    autolink_urls(content)
+
+    def length_of_words_from(start):
+        words = dotted_words.match(content, start)
+        return words.end() - start if words else 0
+
+    # Each attempt to match `url` can go over the rest of the run of words
+    # it starts in. Trying it at every position in a run would go over the
+    # run once for each character in it, taking quadratic time
+    words_gone_over = sum(
+        length_of_words_from(start) for (_, start), _ in url_mock.match.call_args_list
+    )
+    assert url_mock.match.called
+    assert words_gone_over <= len(content)
@@ -1,4 +1,5 @@
 from functools import partial
+from unittest.mock import call, patch
 
 import pytest
 
@@ -94,3 +95,72 @@ def test_maintains_insertion_order():
     assert d.keys() == ["b", "a", "c"]
     d["BB"] = None
     assert d.keys() == ["b", "a", "c", "bb"]
+
+
+def test_get_normalises_key_once():
+    d = InsensitiveDict({"First Name": "Jo"})
+    with patch.object(
+        InsensitiveDict, "make_key", wraps=InsensitiveDict.make_key
+    ) as mock_make_key:
+        assert d.get("FIRST_NAME") == "Jo"
+        assert d.get("last name", "Smith") == "Smith"
+    assert mock_make_key.call_args_list == [call("FIRST_NAME"), call("last name")]
+
+
+def test_make_key_remembers_more_than_32_keys():
+    keys = [f"Column {index}" for index in range(100)]
+    assert [InsensitiveDict.make_key(key) for key in keys] == [
+        f"column{index}" for index in range(100)
+    ]
+    with patch("notifications_utils.insensitive_dict.intern") as mock_intern:
+        assert [InsensitiveDict.make_key(key) for key in keys] == [
+            f"column{index}" for index in range(100)
+        ]
+    assert mock_intern.called is False
+
+
+def test_make_key_interns_normalised_keys():
+    assert InsensitiveDict.make_key("First Name") is InsensitiveDict.make_key(
+        "first_name"
+    )
+    assert InsensitiveDict.make_key(None) is None
+
+
+def test_make_key_handles_none_when_no_keys_are_remembered():
+    with patch.dict(
+        "notifications_utils.insensitive_dict._normalised_keys", clear=True
+    ):
+        assert InsensitiveDict.make_key(None) is None
+        assert InsensitiveDict.make_key("Name") == "name"
+        assert InsensitiveDict.make_key(None) is None
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda d: d.__setitem__("C", 3),
+        lambda d: d.__delitem__("a"),
+        lambda d: d.pop("a"),
+        lambda d: d.popitem(),
+        lambda d: d.setdefault("c", 3),
+        lambda d: d.update(c=3),
+        lambda d: d.__ior__({"c": 3}),
+        lambda d: d.clear(),
+    ],
+)
+def test_keys_are_cached_until_dictionary_changes(mutate):
+    d = InsensitiveDict({"A": 1, "B": 2})
+    assert d.keys() is d.keys()
+    mutate(d)
+    assert d.keys() == list(dict.keys(d))
+
+
+def test_from_normalised_keys_does_not_normalise_again():
+    with patch.object(InsensitiveDict, "make_key") as mock_make_key:
+        d = InsensitiveDict.from_normalised_keys({"firstname": "Jo"})
+        copied = d.copy()
+        constructed = InsensitiveDict(d)
+    assert mock_make_key.called is False
+    assert d == copied == constructed == {"firstname": "Jo"}
+    assert type(copied) is type(constructed) is InsensitiveDict
+    assert d["First Name"] == "Jo"
@@ -1,7 +1,14 @@
+import mistune
 import pytest
 
 from notifications_utils.markdown import (
+    NotifyEmailMarkdownRenderer,
+    NotifyEmailPreheaderMarkdownRenderer,
+    NotifyLetterMarkdownPreviewRenderer,
+    NotifyPlainTextEmailMarkdownRenderer,
+    _lex_blocks,
     notify_email_markdown,
+    notify_email_preheader_markdown,
     notify_letter_preview_markdown,
     notify_plain_text_email_markdown,
 )
@@ -665,3 +672,49 @@ def test_strikethrough(markdown_function, expected):
 def test_footnotes():
     # Can’t work out how to test this
     pass
+
+
+def test_renderers_share_lexed_block_tokens():
+    text = "# Lexed once\n\n* one\n* two\n\n^ Inset\n\nSee [this][1]\n\n[1]: https://example.com"
+    _lex_blocks.cache_clear()
+
+    notify_email_markdown(text)
+    notify_email_preheader_markdown(text)
+    notify_plain_text_email_markdown(text)
+    notify_letter_preview_markdown(text)
+
+    assert _lex_blocks.cache_info().misses == 1
+    assert _lex_blocks.cache_info().hits == 3
+
+
+@pytest.mark.parametrize(
+    "markdown_function, renderer_class, options",
+    (
+        (notify_email_markdown, NotifyEmailMarkdownRenderer, {"use_xhtml": False}),
+        (notify_plain_text_email_markdown, NotifyPlainTextEmailMarkdownRenderer, {}),
+        (notify_email_preheader_markdown, NotifyEmailPreheaderMarkdownRenderer, {}),
+        (
+            notify_letter_preview_markdown,
+            NotifyLetterMarkdownPreviewRenderer,
+            {"use_xhtml": False},
+        ),
+    ),
+)
+@pytest.mark.parametrize(
+    "text",
+    (
+        "",
+        "# Heading\n\nParagraph\nwith a line break",
+        "1. one\n2. two\n\n* three\n    * four",
+        "^ Inset\n^ text\n\n---\n\nMore",
+        "[link][1] and [link][2]\n\n[1]: https://example.com\n[2]: https://gov.uk",
+        "Note[^1] and note[^2]\n\n[^1]: First\n[^2]: Second",
+        "```\ncode\n```\n\n    indented\n\n| a | b |\n|---|---|\n| c | d |",
+    ),
+)
+def test_rendering_from_lexed_block_tokens_matches_lexing_again(
+    markdown_function, renderer_class, options, text
+):
+    uncached = mistune.Markdown(renderer=renderer_class(), hard_wrap=True, **options)
+    # Twice, so the second render comes from the cached tokens
+    assert markdown_function(text) == markdown_function(text) == uncached(text)
@@ -0,0 +1,146 @@
+import gc
+import re
+import weakref
+from random import Random
+from unittest import mock
+
+import pytest
+
+from notifications_utils.formatters import (
+    make_quotes_smart,
+    normalise_multiple_newlines,
+    remove_whitespace_before_punctuation,
+    replace_hyphens_with_en_dashes,
+    unlink_govuk_escaped,
+)
+from notifications_utils.pipeline import Pipeline, substitutes, triggered_by
+
+
+def _uppercase(value):
+    return value.upper()
+
+
+def _exclaim(value):
+    return value + "!"
+
+
+def test_pipeline():
+    assert Pipeline(_uppercase, _exclaim, str.strip)(" hello world ") == (
+        "HELLO WORLD !"
+    )
+
+
+def test_pipeline_returns_plain_string():
+    assert type(Pipeline(_uppercase)(mock.Mock(__str__=lambda _: "hello"))) is str
+
+
+def test_pipeline_calls_formatters_looked_up_when_called():
+    with mock.patch(
+        "tests.test_pipeline._uppercase", return_value="patched"
+    ) as mock_uppercase:
+        assert Pipeline(_uppercase, _exclaim)("hello") == "patched!"
+    mock_uppercase.assert_called_once_with("hello")
+    assert Pipeline(_uppercase, _exclaim)("hello") == "HELLO!"
+
+
+@pytest.mark.parametrize(
+    "formatter, value",
+    [
+        (remove_whitespace_before_punctuation, "no punctuation here "),
+        (make_quotes_smart, "nothing to make smart"),
+        (replace_hyphens_with_en_dashes, "no dashes here"),
+        (unlink_govuk_escaped, "nothing to unlink"),
+        (normalise_multiple_newlines, "two\n\nnewlines"),
+    ],
+)
+def test_pipeline_skips_formatters_without_their_trigger_characters(formatter, value):
+    (stage,) = Pipeline(formatter).stages
+    assert not stage.trigger(value)
+    assert Pipeline(formatter)(value) == formatter(value) == value
+
+
+def test_triggers_only_skip_formatters_which_would_do_nothing():
+    assert (
+        Pipeline(
+            remove_whitespace_before_punctuation,
+            make_quotes_smart,
+            replace_hyphens_with_en_dashes,
+            unlink_govuk_escaped,
+        )("It's at GOV.UK - with a comma , ")
+        == "It’s at GOV.\u200bUK – with a comma, "
+    )
+
+
+def test_triggered_formatters_are_kept_so_their_ids_cant_be_reused():
+    @triggered_by("x")
+    def _x_to_y(value):
+        return value.replace("x", "y")
+
+    formatter = weakref.ref(_x_to_y)
+    del _x_to_y
+    gc.collect()
+
+    # Otherwise another function could be given the same `id`, and be
+    # mistaken for this one
+    assert formatter() is not None
+
+
+def test_pipeline_merges_substitutions_which_cant_affect_each_other():
+    pipeline = Pipeline(
+        remove_whitespace_before_punctuation, normalise_multiple_newlines
+    )
+    assert [stage.name for stage in pipeline.stages] == [
+        "remove_whitespace_before_punctuation+normalise_multiple_newlines"
+    ]
+    assert pipeline("a ,\n\n\n\nb \t.") == "a,\n\nb."
+
+
+def test_pipeline_doesnt_merge_substitutions_which_could_affect_each_other():
+    @substitutes(re.compile("a+"), "b", characters="ab")
+    def _a_to_b(value):
+        return re.sub("a+", "b", value)
+
+    @substitutes(re.compile("bb"), "c", characters="bc")
+    def _bb_to_c(value):
+        return value.replace("bb", "c")
+
+    pipeline = Pipeline(_a_to_b, _bb_to_c)
+    assert len(pipeline.stages) == 2
+    assert pipeline("aab") == "c"
+
+
+def test_merged_substitutions_match_running_in_turn():
+    alphabet = [" ", "\t", ",", ".", "\n", "a", "\r"]
+    merged = Pipeline(remove_whitespace_before_punctuation, normalise_multiple_newlines)
+    rng = Random(0)
+    for _ in range(1000):
+        value = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+        assert merged(value) == normalise_multiple_newlines(
+            remove_whitespace_before_punctuation(value)
+        )
+
+
+def test_merged_substitutions_keep_their_flags():
+    @triggered_by("X", "x")
+    @substitutes(re.compile("x", re.IGNORECASE), "y", characters="Xxy")
+    def _x_to_y(value):
+        return re.sub("(?i)x", "y", value)
+
+    pipeline = Pipeline(_x_to_y, remove_whitespace_before_punctuation)
+    assert len(pipeline.stages) == 1
+    assert pipeline("X x .") == "y y."
+    assert pipeline("no change") == "no change"
+
+
+def test_pipeline_records_timings_when_profiling(mocker):
+    mocker.patch.object(Pipeline, "timings", Pipeline.timings.copy())
+    Pipeline.timings.clear()
+
+    Pipeline(_uppercase, replace_hyphens_with_en_dashes)("hello - world")
+    assert Pipeline.timings == {}
+
+    mocker.patch.object(Pipeline, "profiling", True)
+    Pipeline(_uppercase, replace_hyphens_with_en_dashes)("hello - world")
+    Pipeline(_uppercase)("hello")
+    assert set(Pipeline.timings) == {"_uppercase", "replace_hyphens_with_en_dashes"}
+    assert all(timing >= 0 for timing in Pipeline.timings.values())
@@ -8,6 +8,7 @@ from notifications_utils.postal_address import (
     format_postcode_for_printing,
     is_a_real_uk_postcode,
     normalise_postcode,
+    validate_postal_addresses,
 )
 
 
@@ -775,3 +776,37 @@ def test_valid_from_personalisation_with_international_parameter(
         ).valid
         is expected_valid
     )
+
+
+@pytest.mark.parametrize("address", ("UK", "United Kingdom\n", "\n\nWales"))
+def test_address_which_is_only_a_uk_country_is_invalid(address):
+    postal_address = PostalAddress(address)
+    assert postal_address.postcode is None
+    assert postal_address.valid is False
+
+
+@pytest.mark.parametrize("international", (True, False))
+def test_validate_postal_addresses(mocker, international):
+    addresses = [
+        "1 Example Street\nLondon\nSW1A 1AA",
+        "1 Example Street\nParis\nFrance",
+        "1 Example Street\nLondon\nSW1A 1AA",
+        "Not enough lines\nSW1A 1AA",
+        "UK",
+        "",
+    ]
+    mock_postal_address = mocker.patch(
+        "notifications_utils.postal_address.PostalAddress", wraps=PostalAddress
+    )
+    assert validate_postal_addresses(
+        addresses, allow_international_letters=international
+    ) == [True, international, True, False, False, False]
+    # Each distinct address is only parsed once
+    assert mock_postal_address.call_count == 5
+    mock_postal_address.reset_mock()
+    assert validate_postal_addresses(
+        addresses, allow_international_letters=international
+    ) == [
+        PostalAddress(address, allow_international_letters=international).valid
+        for address in addresses
+    ]
@@ -1,9 +1,13 @@
 import itertools
+import mmap
 import string
+import tracemalloc
 import unicodedata
+from collections import Counter
 from functools import partial
+from io import BytesIO
 from random import choice, randrange
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
 from ordered_set import OrderedSet
@@ -11,11 +15,20 @@ from ordered_set import OrderedSet
 from notifications_utils import SMS_CHAR_COUNT_LIMIT
 from notifications_utils.countries import Country
 from notifications_utils.formatters import strip_and_remove_obscure_whitespace
+from notifications_utils.insensitive_dict import InsensitiveDict
+from notifications_utils.postal_address import (
+    PostalAddress,
+    validate_postal_addresses,
+)
 from notifications_utils.recipients import (
     Cell,
+    GuestList,
     RecipientCSV,
     Row,
     first_column_headings,
+    validate_email_addresses,
+    validate_phone_number,
+    validate_phone_numbers,
 )
 from notifications_utils.template import (
     EmailPreviewTemplate,
@@ -369,6 +382,75 @@ def test_big_list_validates_right_through(
     assert big_csv.has_errors
 
 
+@pytest.mark.parametrize(
+    "template_type, row_count, header, filler, row_with_error",
+    [
+        (
+            "email",
+            500,
+            "email address,name\n",
+            "test@example.com,Jo\n",
+            "test at example dot com,",
+        ),
+        ("sms", 500, "phone number,name\n", "2348675309,Jo\n", "12345,"),
+    ],
+)
+def test_summary_matches_full_validation(
+    template_type, row_count, header, filler, row_with_error
+):
+    file_contents = header + (filler * (row_count - 1) + row_with_error)
+    template = _sample_template(template_type, "hello ((name))")
+    recipients = RecipientCSV(
+        file_contents, template=template, max_errors_shown=2, max_initial_rows_shown=3
+    )
+    summary = RecipientCSV(
+        file_contents, template=template, max_errors_shown=2, max_initial_rows_shown=3
+    ).summarise()
+
+    assert len(summary) == len(recipients) == row_count
+    assert summary.count_of_rows_with_errors == len(list(recipients.rows_with_errors))
+    assert summary.count_of_rows_with_bad_recipients == 1
+    assert summary.count_of_rows_with_missing_data == 1
+    assert summary.count_of_rows_with_message_too_long == 0
+    assert summary.count_of_rows_with_empty_message == 0
+    assert _index_rows(summary.initial_rows) == _index_rows(recipients.initial_rows)
+    assert _index_rows(summary.displayed_rows) == _index_rows(recipients.displayed_rows)
+    assert summary.has_errors is recipients.has_errors is True
+    assert summary.too_many_rows is recipients.too_many_rows is False
+
+
+def test_summary_does_not_keep_rows_in_memory():
+    recipients = RecipientCSV(
+        "phone number\n" + ("2348675309\n" * 50),
+        template=_sample_template("sms"),
+        max_initial_rows_shown=5,
+    )
+    summary = recipients.summarise()
+
+    assert len(summary) == 50
+    assert len(summary.initial_rows) == 5
+    assert summary.initial_rows_with_errors == []
+    assert recipients.rows_as_list is None
+    assert not summary.has_errors
+
+
+def test_summary_checks_guestlist_and_limits():
+    recipients = RecipientCSV(
+        "phone number\n2348675309\n2348675301\n2348675302\n",
+        template=_sample_template("sms"),
+        guestlist=["+12348675309"],
+        remaining_messages=2,
+    )
+    recipients.max_rows = 2
+    summary = recipients.summarise()
+
+    assert summary.allowed_to_send_to is False
+    assert summary.more_rows_than_can_send is True
+    assert summary.too_many_rows is True
+    assert summary.initial_rows[2] is None
+    assert summary.has_errors is True
+
+
 @pytest.mark.parametrize(
     "template_type, row_count, header, filler",
     [
@@ -414,7 +496,11 @@ def test_overly_big_list_stops_processing_rows_beyond_max(mocker):
     assert big_csv.too_many_rows
     assert len(big_csv) == 123
 
-    # …but we’ve only called the expensive whitespace function on each
+    # …which we can count without processing any of them…
+    assert mock_strip_and_remove_obscure_whitespace.called is False
+    assert len(big_csv.rows) == 123
+
+    # …and when we do process them we’ve only called the expensive whitespace function on each
     # of the 2 cells in the first 10 rows
     assert len(mock_strip_and_remove_obscure_whitespace.call_args_list) == 20
 
@@ -423,6 +509,416 @@ def test_overly_big_list_stops_processing_rows_beyond_max(mocker):
     assert len(mock_insert_or_append_to_dict.call_args_list) == 10
 
 
+def _describe_rows(rows):
+    return [
+        (
+            (
+                row.index,
+                row.message_too_long,
+                row.message_empty,
+                [
+                    (key, cell.data, cell.error, cell.ignore)
+                    for key, cell in row.items()
+                ],
+            )
+            if row is not None
+            else None
+        )
+        for row in rows
+    ]
+
+
+@pytest.mark.parametrize(
+    "file_contents, template_type",
+    [
+        (
+            """
+                phone number, name, extra
+                2348675309, Jo, a
+                12345, , b
+                +1 234-867-5301, Sam
+                , Alex, c, d
+                2348675302, Max, e
+            """,
+            "sms",
+        ),
+        (
+            """
+                email address, name, name
+                test@example.com, Jo, Jo
+                test at example dot com, ,
+                test2@example.com, Sam, Max
+            """,
+            "email",
+        ),
+        (
+            """
+                address_line_1, address_line_2, postcode, name
+                A Person, 1 Street, SE1 7LS, Jo
+                A Person, , , Sam
+                "A Person, Esq", 2 Street, XX1 1XX,
+            """,
+            "letter",
+        ),
+    ],
+)
+@pytest.mark.parametrize("rows_per_chunk", [1, 2, 100])
+def test_rows_validated_in_parallel_match_rows_validated_in_serial(
+    file_contents, template_type, rows_per_chunk
+):
+    template = _sample_template(template_type, "hello ((name))")
+    serial = RecipientCSV(file_contents, template=template)
+    parallel = RecipientCSV(file_contents, template=template)
+    parallel.max_rows = 4
+
+    parallel_rows = list(
+        parallel.get_rows_in_parallel(max_workers=2, rows_per_chunk=rows_per_chunk)
+    )
+    serial.max_rows = 4
+
+    assert _describe_rows(parallel_rows) == _describe_rows(serial.rows)
+
+
+@pytest.mark.parametrize(
+    "first_content, second_content",
+    [
+        ("hello ((name))", "((extra)) ((other))"),
+        ("((extra)) ((other))", "hello ((name))"),
+        ("hello ((name))", "((name)) " + "a" * 1_000),
+        ("((name))", "hello"),
+    ],
+)
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_changing_template_matches_new_recipient_csv(
+    first_content, second_content, max_workers
+):
+    file_contents = """
+        phone number, name, extra
+        2348675309, Jo, a
+        12345, , b
+        +1 234-867-5301, Sam
+        , , c, d
+    """
+    recipients = RecipientCSV(
+        file_contents,
+        template=_sample_template("sms", first_content),
+        max_workers=max_workers,
+    )
+    list(recipients.rows)
+
+    recipients.template = _sample_template("sms", second_content)
+
+    assert _describe_rows(recipients.rows) == _describe_rows(
+        RecipientCSV(
+            file_contents, template=_sample_template("sms", second_content)
+        ).rows
+    )
+
+
+def test_changing_template_reuses_parsed_and_validated_rows(mocker):
+    recipients = RecipientCSV(
+        "phone number, name\n2348675309, Jo\n12345,",
+        template=_sample_template("sms", "hello"),
+    )
+    rows = recipients.rows
+    assert [row.has_missing_data for row in recipients.rows] == [False, False]
+    get_row_dicts_from = mocker.patch.object(RecipientCSV, "_get_row_dicts_from")
+    validate_phone_numbers = mocker.patch(
+        "notifications_utils.recipients.validate_phone_numbers"
+    )
+    validate_phone_number = mocker.patch(
+        "notifications_utils.recipients.validate_phone_number"
+    )
+
+    recipients.template = _sample_template("sms", "hello ((name)) ((other))")
+
+    assert recipients.rows is rows
+    assert [row.has_missing_data for row in recipients.rows] == [False, True]
+    assert [row.has_bad_recipient for row in recipients.rows] == [False, True]
+    assert recipients.missing_column_headers == {"other"}
+    assert get_row_dicts_from.called is False
+    assert validate_phone_numbers.called is False
+    assert validate_phone_number.called is False
+
+
+def test_changing_template_type_validates_rows_again():
+    recipients = RecipientCSV(
+        "phone number, email address\n2348675309, test@example.com",
+        template=_sample_template("sms"),
+    )
+    assert recipients.rows[0].recipient == "2348675309"
+
+    recipients.template = _sample_template("email")
+
+    assert recipients.rows[0].recipient == "test@example.com"
+    assert not recipients.has_errors
+
+
+def _map(path):
+    with path.open("rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@pytest.mark.parametrize(
+    "open_file",
+    [
+        lambda path: path,
+        lambda path: str(path),
+        lambda path: path.read_bytes(),
+        lambda path: BytesIO(path.read_bytes()),
+        lambda path: path.open("rb"),
+        lambda path: _map(path),
+    ],
+)
+def test_from_file_matches_recipient_csv_from_string(tmp_path, open_file):
+    file_contents = (
+        "\ufeff \n,,\r\n"
+        'phone number,name,"address\nlines"\r\n'
+        '2348675309, Zoë ,"1 Street\nTown"\r\n'
+        "12345,,\r\n"
+        "+1 234-867-5301,Sam\u00a0\r\n"
+        ",,\r\n"
+        "\u200b\n\n"
+    )
+    path = tmp_path / "file.csv"
+    path.write_bytes(file_contents.encode("utf-8"))
+    template = _sample_template("sms", "hello ((name))")
+
+    from_string = RecipientCSV(file_contents, template=template)
+    from_file = RecipientCSV.from_file(open_file(path), template=template)
+
+    assert from_file.column_headers == from_string.column_headers
+    assert _describe_rows(from_file.rows) == _describe_rows(from_string.rows)
+    assert len(from_file) == len(from_string) == 3
+
+
+def test_from_file_only_decodes_rows_when_they_are_read():
+    recipients = RecipientCSV.from_file(
+        BytesIO(
+            b"phone number,name\n"
+            + b"2348675309,Jo\n" * 1_000
+            + b"2348675309,\xff\xfe\n"
+        ),
+        template=_sample_template("sms", "hello ((name))"),
+    )
+
+    assert recipients.column_headers == ["phone number", "name"]
+    with pytest.raises(UnicodeDecodeError):
+        recipients.rows
+
+
+def test_from_file_reads_empty_file(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"")
+
+    recipients = RecipientCSV.from_file(path, template=_sample_template("sms"))
+
+    assert recipients.column_headers == []
+    assert len(recipients) == 0
+
+
+def test_from_file_reads_from_current_position_of_file(tmp_path):
+    path = tmp_path / "file.csv"
+    path.write_bytes(b"ignored line\nphone number\n2348675309\n")
+
+    for file in (path.open("rb"), BytesIO(path.read_bytes())):
+        file.readline()
+        recipients = RecipientCSV.from_file(file, template=_sample_template("sms"))
+
+        assert recipients.column_headers == ["phone number"]
+        assert [row.recipient for row in recipients.rows] == ["2348675309"]
+
+
+def test_from_file_closes_file_it_maps(tmp_path):
+    path = tmp_path / "file.csv"
+    path.write_bytes(b"phone number\n2348675309\n")
+
+    with RecipientCSV.from_file(path, template=_sample_template("sms")) as recipients:
+        assert len(recipients) == 1
+    assert recipients._file.data.closed
+
+    with pytest.raises(ValueError):
+        recipients.rows
+
+
+def test_from_file_leaves_mmap_it_was_given_open(tmp_path):
+    path = tmp_path / "file.csv"
+    path.write_bytes(b"phone number\n2348675309\n")
+    mapped_file = _map(path)
+
+    with RecipientCSV.from_file(mapped_file, template=_sample_template("sms")):
+        pass
+    assert not mapped_file.closed
+    mapped_file.close()
+
+
+def test_from_file_has_no_file_data():
+    recipients = RecipientCSV.from_file(
+        b"phone number\n2348675309\n", template=_sample_template("sms")
+    )
+    assert not hasattr(recipients, "file_data")
+    assert RecipientCSV("phone number", template=_sample_template("sms")).file_data
+
+
+def test_from_file_reads_other_encodings():
+    recipients = RecipientCSV.from_file(
+        "phone number,name\n2348675309,Zoë\n".encode("latin-1"),
+        template=_sample_template("sms", "hello ((name))"),
+        encoding="latin-1",
+    )
+
+    assert recipients.rows[0]["name"].data == "Zoë"
+
+
+def test_max_workers_validates_rows_in_parallel(mocker):
+    get_chunks_in_parallel = mocker.patch.object(
+        RecipientCSV, "_get_chunks_in_parallel", return_value=iter([])
+    )
+    get_rows_in_parallel = mocker.patch.object(
+        RecipientCSV, "get_rows_in_parallel", return_value=iter([])
+    )
+    recipients = RecipientCSV(
+        "phone number\n2348675309",
+        template=_sample_template("sms"),
+        max_workers=3,
+    )
+
+    assert list(recipients.rows) == []
+    recipients.summarise()
+
+    get_chunks_in_parallel.assert_called_once_with(3)
+    get_rows_in_parallel.assert_called_once_with(max_workers=3)
+
+
+def test_rows_from_columnar_storage_match_rows_from_get_rows():
+    recipients = RecipientCSV(
+        """
+            phone number, name, , Name, extra
+            2348675309, Jo, , Jo, a
+            12345, , x, , b
+            +1 234-867-5301, Sam
+            , Alex, , , c, d
+        """,
+        template=_sample_template("sms", "hello ((name))"),
+    )
+
+    assert _describe_rows(recipients.rows) == _describe_rows(recipients.get_rows())
+    assert [row.recipient for row in recipients.rows] == [
+        row.recipient for row in recipients.get_rows()
+    ]
+    assert [dict(row.personalisation) for row in recipients.rows] == [
+        dict(row.personalisation) for row in recipients.get_rows()
+    ]
+    assert recipients.rows[-1] == recipients.rows[3]
+    assert [row.index for row in recipients.rows[1:3]] == [1, 2]
+
+
+def test_rows_are_views_onto_columnar_storage():
+    recipients = RecipientCSV(
+        "phone number,name\n" + ("2348675309,Jo\n" * 2_000),
+        template=_sample_template("sms", "hello ((name))"),
+    )
+
+    def measure_memory_used_by(get_rows):
+        tracemalloc.start()
+        rows = get_rows()
+        memory_used, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return rows, memory_used
+
+    rows, memory_used = measure_memory_used_by(lambda: recipients.rows)
+    # Each row from `get_rows` has storage of its own
+    _, memory_used_by_separate_rows = measure_memory_used_by(
+        lambda: list(recipients.get_rows())
+    )
+
+    assert len(rows) == 2_000
+    assert memory_used < memory_used_by_separate_rows / 4
+    assert not hasattr(rows[0], "__dict__")
+    assert not hasattr(rows[0]["phone number"], "__dict__")
+    assert rows[0]["phone number"].data == "2348675309"
+    assert rows[0]["phone number"].error is None
+    assert rows[0]["name"].ignore is False
+    assert rows[0].has_error is False
+
+
+@pytest.mark.parametrize(
+    "template_type, file_contents, expected",
+    [
+        (
+            "sms",
+            "Phone_Number, Name, colour",
+            [
+                ("Phone_Number", "phonenumber", True, True, False, True),
+                ("Name", "name", False, True, False, False),
+                ("colour", "colour", False, False, False, False),
+            ],
+        ),
+        (
+            "email",
+            "name, email address",
+            [
+                ("name", "name", False, True, False, False),
+                ("email address", "emailaddress", True, True, False, True),
+            ],
+        ),
+        (
+            "letter",
+            "address line 1, postcode, name",
+            [
+                ("address line 1", "addressline1", True, True, True, False),
+                ("postcode", "postcode", True, True, True, False),
+                ("name", "name", False, True, False, False),
+            ],
+        ),
+    ],
+)
+def test_column_plan(template_type, file_contents, expected):
+    recipients = RecipientCSV(
+        file_contents, template=_sample_template(template_type, "((name))")
+    )
+    assert [
+        (
+            column.header,
+            column.key,
+            column.is_recipient_column,
+            column.is_placeholder,
+            column.is_address_column,
+            column.validator is not None,
+        )
+        for column in recipients.column_plan
+    ] == expected
+
+
+def test_column_plan_is_worked_out_once_per_file(mocker):
+    recipients = RecipientCSV(
+        "phone number,name,colour\n" + ("2348675309,Jo,red\n" * 100),
+        template=_sample_template("sms", "hello ((name))"),
+    )
+    plan_column = mocker.patch.object(
+        RecipientCSV, "_plan_column", wraps=recipients._plan_column
+    )
+
+    assert not recipients.has_errors
+    list(recipients.get_rows())
+
+    # Once for each column, and once for cells which aren’t in a column
+    assert plan_column.call_count == 4
+
+
+def test_column_plan_is_worked_out_again_when_placeholders_change():
+    recipients = RecipientCSV(
+        "phone number,name\n2348675309,\n",
+        template=_sample_template("sms", "hello"),
+    )
+    assert not recipients.rows[0].has_error
+
+    recipients.placeholders = ["name"]
+    recipients.rows_as_list = None
+
+    assert recipients.rows[0]["name"].error == "Missing"
+
+
 def test_file_with_lots_of_empty_columns():
     process = Mock()
 
@@ -810,6 +1306,58 @@ def test_errors_when_too_many_rows():
     assert recipients.rows[100] is None
 
 
+def test_checking_limits_does_not_validate_rows(mocker):
+    get_row_dicts_from = mocker.patch.object(RecipientCSV, "_get_row_dicts_from")
+    recipients = RecipientCSV(
+        "email address\n" + ("a@b.com\n" * 101),
+        template=_sample_template("email"),
+        remaining_messages=50,
+    )
+    recipients.max_rows = 100
+
+    assert recipients.too_many_rows is True
+    assert recipients.more_rows_than_can_send is True
+    assert recipients.has_errors is True
+    assert len(recipients) == 101
+    assert get_row_dicts_from.called is False
+
+
+@pytest.mark.parametrize(
+    "file_contents, stop_after, expected_count",
+    [
+        ("", None, 0),
+        ("phone number", None, 0),
+        ("phone number\n2348675309\n2348675309\n2348675309", None, 3),
+        ("phone number\n2348675309\n2348675309\n2348675309", 1, 2),
+        ("phone number\n2348675309\n2348675309\n2348675309", 3, 3),
+        ('phone number,name\n2348675309,"Jo\nSmith"\n2348675309,Sam', None, 2),
+        ("phone number\r\n2348675309\r\n\r\n2348675309\r\n", None, 3),
+    ],
+)
+def test_count_rows(file_contents, stop_after, expected_count):
+    recipients = RecipientCSV(file_contents, template=_sample_template("sms"))
+
+    assert recipients.count_rows(stop_after=stop_after) == expected_count
+    # Counting once the rows have been built gives the same answer
+    if stop_after is None:
+        assert len(recipients.rows) == expected_count
+        assert recipients.count_rows() == expected_count
+
+
+def test_count_rows_stops_reading_once_limit_is_exceeded(mocker):
+    recipients = RecipientCSV(
+        "phone number\n" + ("2348675309\n" * 1_000),
+        template=_sample_template("sms"),
+    )
+    lines_of = mocker.patch(
+        "notifications_utils.recipients._lines_of",
+        return_value=iter(["phone number\n"] + ["2348675309\n"] * 1_000),
+    )
+
+    assert recipients.count_rows(stop_after=9) == 10
+    assert len(list(lines_of.return_value)) == 1_000 - 10
+
+
 @pytest.mark.parametrize(
     "file_contents,template_type,guestlist,count_of_rows_with_errors",
     [
@@ -885,6 +1433,27 @@ def test_recipient_guestlist(
     assert recipients.allowed_to_send_to
 
 
+def test_recipient_guestlist_can_be_reused(mocker):
+    guest_list = GuestList(["2348675309", "2348675301"])
+    mock_format_recipient = mocker.patch(
+        "notifications_utils.recipients.format_recipient",
+        side_effect=lambda recipient: recipient,
+    )
+
+    for file_contents, allowed_to_send_to in (
+        ("phone number\n+12348675309\n+12348675301", True),
+        ("phone number\n+12348675309\n+12348675302", False),
+    ):
+        recipients = RecipientCSV(
+            file_contents, template=_sample_template("sms"), guestlist=guest_list
+        )
+        assert recipients.guestlist is guest_list
+        assert recipients.allowed_to_send_to is allowed_to_send_to
+
+    # Each recipient is formatted once, not once per guest list entry
+    assert mock_format_recipient.call_count == 4
+
+
 def test_detects_rows_which_result_in_overly_long_messages():
     template = SMSMessageTemplate(
         {"content": "((placeholder))", "template_type": "sms"},
@@ -1354,3 +1923,181 @@ def test_recipient_csv_checks_should_validate_flag(should_validate):
 
     assert template.is_message_empty.called is should_validate
     assert recipients._get_error_for_field.called is should_validate
+
+
+@pytest.mark.parametrize("international_sms", [False, True])
+def test_recipient_csv_validates_phone_numbers_in_bulk(mocker, international_sms):
+    mock_validate_phone_numbers = mocker.patch(
+        "notifications_utils.recipients.validate_phone_numbers",
+        wraps=validate_phone_numbers,
+    )
+    mock_validate_phone_number = mocker.patch(
+        "notifications_utils.recipients.validate_phone_number",
+        wraps=validate_phone_number,
+    )
+    recipients = RecipientCSV(
+        """
+            phone number
+            +12025550104
+            +12025550104
+            +447700900460
+            +18765550104
+            (202) 555-0104
+            not a number
+        """,
+        template=_sample_template("sms"),
+        allow_international_sms=international_sms,
+    )
+
+    assert [row.get("phone number").error for row in recipients.rows] == [
+        None,
+        None,
+        "Not a US number" if not international_sms else "Invalid country code",
+        None if international_sms else "Not a US number",
+        None,
+        "The string supplied did not seem to be a phone number.",
+    ]
+    mock_validate_phone_numbers.assert_called_once_with(
+        [
+            "+12025550104",
+            "+12025550104",
+            "+447700900460",
+            "+18765550104",
+            "(202) 555-0104",
+            "not a number",
+        ],
+        international=international_sms,
+    )
+    # Only the numbers which aren’t already in E.164 format need parsing
+    assert [call.args[0] for call in mock_validate_phone_number.call_args_list] == [
+        "+447700900460",
+        "(202) 555-0104",
+        "not a number",
+    ]
+
+
+def test_recipient_csv_validates_email_addresses_in_bulk(mocker):
+    mock_validate_email_addresses = mocker.patch(
+        "notifications_utils.recipients.validate_email_addresses",
+        wraps=validate_email_addresses,
+    )
+    recipients = RecipientCSV(
+        """
+            email address
+            test@example.com
+            test@example.com
+            not an email address
+        """,
+        template=_sample_template("email"),
+    )
+
+    assert [row.get("email address").error for row in recipients.rows] == [
+        None,
+        None,
+        "Not a valid email address",
+    ]
+    mock_validate_email_addresses.assert_called_once_with(
+        ["test@example.com", "test@example.com", "not an email address"]
+    )
+
+
+def test_recipient_csv_validates_postal_addresses_in_bulk(mocker):
+    mock_validate_postal_addresses = mocker.patch(
+        "notifications_utils.recipients.validate_postal_addresses",
+        wraps=validate_postal_addresses,
+    )
+    recipients = RecipientCSV(
+        """
+            address line 1, address line 2, postcode
+            First Lastname, 123 Example St, SW1A 1AA
+            First Lastname, 123 Example St, SW1A 1AA
+            First Lastname, 123 Example St, Not a postcode
+        """,
+        template=_sample_template("letter"),
+    )
+    rows = recipients.rows
+    mock_validate_postal_addresses.assert_called_once_with(
+        ["First Lastname\n123 Example St\n\n\n\n\nSW1A 1AA"] * 2
+        + ["First Lastname\n123 Example St\n\n\n\n\nNot a postcode"],
+        allow_international_letters=False,
+    )
+
+    # The rows remember whether their address is valid rather than
+    # parsing it again each time they’re asked
+    mock_valid = mocker.patch.object(PostalAddress, "valid", new_callable=PropertyMock)
+    assert [row.has_bad_postal_address for row in rows] == [False, False, True]
+    assert [row.has_error for row in rows] == [False, False, True]
+    assert [row.has_bad_recipient for row in rows] == [False, False, True]
+    assert mock_valid.called is False
+
+
+def test_row_checks_postal_address_once():
+    row = Row(
+        {
+            "address_line_1": "First Lastname",
+            "address_line_2": "123 Example St",
+            "address_line_3": "Fiji",
+        },
+        index=0,
+        error_fn=None,
+        recipient_column_headers=["address_line_1"],
+        placeholders=InsensitiveDict.from_keys(["address_line_1"]),
+        template=_sample_template("letter"),
+        allow_international_letters=True,
+    )
+    with patch.object(PostalAddress, "valid", new_callable=PropertyMock) as mock_valid:
+        assert row.has_bad_postal_address is False
+        assert row.has_error is False
+    assert mock_valid.called is False
+
+
+def test_recipient_csv_only_parses_each_distinct_postal_address_once(mocker):
+    mock_init = mocker.patch.object(
+        PostalAddress, "__init__", autospec=True, side_effect=PostalAddress.__init__
+    )
+    recipients = RecipientCSV(
+        "address line 1, address line 2, address line 3, postcode\n"
+        + "\n".join(
+            f"Person {row % 4}, 1 Example Street, London, "
+            + ("SW1A 1AA", "Not a postcode")[row % 2]
+            for row in range(100)
+        ),
+        template=_sample_template("letter"),
+    )
+
+    # Like `RecipientCSVSummary` does for each row
+    for row in recipients.rows:
+        row.has_error
+        row.has_bad_recipient
+
+    assert Counter(call.args[1] for call in mock_init.call_args_list) == {
+        f"Person {person}\n1 Example Street\nLondon\n\n\n\n{postcode}": 1
+        for person, postcode in (
+            (0, "SW1A 1AA"),
+            (1, "Not a postcode"),
+            (2, "SW1A 1AA"),
+            (3, "Not a postcode"),
+        )
+    }
+
+
+def test_get_rows_can_be_used_more_than_once_at_the_same_time():
+    recipients = RecipientCSV(
+        "address line 1, address line 2, postcode\n"
+        + ",,\n" * 3
+        + "First Lastname, 123 Example St, SW1A 1AA\n" * 1_200,
+        template=_sample_template("letter"),
+    )
+
+    first_rows = recipients.get_rows()
+    assert next(first_rows).has_bad_postal_address is True
+
+    second_rows = recipients.get_rows()
+    for _ in range(1_100):
+        assert next(second_rows)
+
+    # The second generator has validated another batch of rows, which
+    # mustn’t change what the first one knows about its own batch
+    assert next(first_rows).has_bad_postal_address is True
+    assert next(first_rows).has_bad_postal_address is True
+    assert next(first_rows).has_bad_postal_address is False
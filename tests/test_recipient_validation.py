@@ -1,6 +1,8 @@
 import pytest
 
+from notifications_utils import recipients
 from notifications_utils.recipients import (
+    GuestList,
     InvalidEmailError,
     InvalidPhoneError,
     allowed_to_send_to,
@@ -12,7 +14,9 @@ from notifications_utils.recipients import (
     try_validate_and_format_phone_number,
     validate_and_format_phone_number,
     validate_email_address,
+    validate_email_addresses,
     validate_phone_number,
+    validate_phone_numbers,
 )
 
 valid_us_phone_numbers = [
@@ -325,6 +329,63 @@ def test_phone_number_rejects_invalid_international_values(phone_number, error_m
     assert error_message == str(e.value)
 
 
+@pytest.mark.parametrize("international", [False, True])
+def test_validate_phone_numbers_matches_validate_phone_number(international):
+    phone_numbers = (
+        valid_phone_numbers
+        + [phone_number for phone_number, _error in invalid_us_phone_numbers]
+        + [phone_number for phone_number, _error in invalid_phone_numbers]
+        + [
+            "+12025550104",  # Duplicate
+            "+18765550104",  # Jamaica
+            "+12125550199",  # Valid format, range not in use
+            "+12345678901",  # Area code not in use
+        ]
+    )
+
+    results = validate_phone_numbers(phone_numbers, international=international)
+
+    assert len(results) == len(phone_numbers)
+    for phone_number, result in zip(phone_numbers, results):
+        try:
+            expected = validate_phone_number(phone_number, international=international)
+        except InvalidPhoneError as error:
+            assert isinstance(result, InvalidPhoneError)
+            assert str(result) == str(error)
+        else:
+            assert result == expected
+
+
+def test_validate_phone_numbers_only_validates_each_number_once(mocker):
+    mock_validate = mocker.patch(
+        "notifications_utils.recipients.validate_phone_number",
+        side_effect=lambda number, international: number,
+    )
+
+    assert validate_phone_numbers(["(202) 555-0104", "12", "(202) 555-0104"]) == [
+        "(202) 555-0104",
+        "12",
+        "(202) 555-0104",
+    ]
+    assert mock_validate.call_args_list == [
+        mocker.call("(202) 555-0104", international=False),
+        mocker.call("12", international=False),
+    ]
+
+
+def test_validate_phone_numbers_does_not_parse_e164_us_numbers(mocker):
+    mock_parse = mocker.patch("phonenumbers.parse")
+
+    assert validate_phone_numbers(["+12025550104", "+18765550104"]) == [
+        "+12025550104",
+        mocker.ANY,
+    ]
+    assert validate_phone_numbers(["+18765550104"], international=True) == [
+        "+18765550104"
+    ]
+    assert mock_parse.called is False
+
+
 @pytest.mark.parametrize("email_address", valid_email_addresses)
 def test_validate_email_address_accepts_valid(email_address):
     try:
@@ -353,6 +414,39 @@ def test_validate_email_address_raises_for_invalid(email_address):
     assert str(e.value) == "Not a valid email address"
 
 
+def test_validate_email_addresses_matches_validate_email_address():
+    email_addresses = (
+        valid_email_addresses + invalid_email_addresses + valid_email_addresses
+    )
+
+    results = validate_email_addresses(email_addresses)
+
+    assert len(results) == len(email_addresses)
+    for email_address, result in zip(email_addresses, results):
+        if email_address in invalid_email_addresses:
+            assert isinstance(result, InvalidEmailError)
+            assert str(result) == "Not a valid email address"
+        else:
+            assert result == validate_email_address(email_address)
+
+
+def test_validate_email_addresses_checks_each_hostname_once():
+    recipients._is_valid_hostname.cache_clear()
+
+    validate_email_addresses(
+        [
+            "one@example.com",
+            "two@example.com",
+            "three@example.com",
+            "four@例え.テスト",
+            "five@例え.テスト",
+        ]
+    )
+
+    assert recipients._is_valid_hostname.cache_info().misses == 2
+    assert recipients._is_valid_hostname.cache_info().hits == 3
+
+
 @pytest.mark.parametrize("phone_number", valid_us_phone_numbers)
 def test_validates_against_guestlist_of_phone_numbers(phone_number):
     assert allowed_to_send_to(
@@ -383,6 +477,27 @@ def test_validates_against_guestlist_of_email_addresses(email_address):
     )
 
 
+def test_guest_list_formats_recipients_once(mocker):
+    mock_format_recipient = mocker.patch(
+        "notifications_utils.recipients.format_recipient",
+        side_effect=format_recipient,
+    )
+    guest_list = GuestList(["2025550104", "Test@Example.com", "2025550104"])
+
+    assert mock_format_recipient.call_count == 3
+    assert len(guest_list) == 2
+    assert set(guest_list) == {"+12025550104", "test@example.com"}
+
+    assert "(202) 555-0104" in guest_list
+    assert "TEST@example.com" in guest_list
+    assert "2025550105" not in guest_list
+    assert allowed_to_send_to("+12025550104", guest_list)
+    assert not allowed_to_send_to("other@example.com", guest_list)
+
+    # Only the recipients being checked need formatting
+    assert mock_format_recipient.call_count == 8
+
+
 @pytest.mark.parametrize(
     "phone_number, expected_formatted",
     [
@@ -0,0 +1,29 @@
+from unittest import mock
+
+from notifications_utils.render_cache import LRURenderCache
+
+
+def test_lru_render_cache_counts_hits_and_misses():
+    cache = LRURenderCache()
+    render = mock.Mock(side_effect=["first", "second"])
+
+    assert cache.get_or_render("a", render) == "first"
+    assert cache.get_or_render("a", render) == "first"
+    assert cache.get_or_render("b", render) == "second"
+
+    assert render.call_count == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_render_cache_forgets_least_recently_used():
+    cache = LRURenderCache(max_size=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.set("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
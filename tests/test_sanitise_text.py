@@ -4,6 +4,7 @@ from notifications_utils.sanitise_text import (
     SanitiseASCII,
     SanitiseSMS,
     SanitiseText,
+    _EncodingTable,
 )
 
 params, ids = zip(
@@ -315,3 +316,27 @@ def test_sms_supporting_additional_languages(content, expected):
 )
 def test_get_non_compatible_characters(content, expected):
     assert SanitiseSMS.get_non_compatible_characters(content) == expected
+
+
+@pytest.mark.parametrize("cls", [SanitiseSMS, SanitiseASCII])
+def test_encode_matches_encoding_each_character(cls):
+    content = "".join(map(chr, range(0x3000))) + "𐤓🐮🔔😀𝔘"
+    assert cls.encode(content) == "".join(map(cls.encode_char, content))
+
+
+def test_encoding_tables_are_not_shared_between_classes():
+    SanitiseASCII.encode("é")
+    SanitiseSMS.encode("é")
+    assert SanitiseSMS._get_encoding_table() is not (
+        SanitiseASCII._get_encoding_table()
+    )
+    assert SanitiseSMS.encode("Ŵ") == "Ŵ"
+    assert SanitiseASCII.encode("Ŵ") == "W"
+
+
+def test_encoding_table_remembers_up_to_max_size(mocker):
+    mocker.patch.object(_EncodingTable, "max_size", 2)
+    table = _EncodingTable(SanitiseSMS.encode_char)
+
+    assert "Ŵé𐤓😀".translate(table) == "Ŵé??"
+    assert len(table) == 2
@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import datetime
 from functools import partial
 from time import process_time
 from unittest import mock
@@ -11,6 +12,7 @@ from markupsafe import Markup
 from ordered_set import OrderedSet
 
 from notifications_utils.formatters import unlink_govuk_escaped
+from notifications_utils.render_cache import LRURenderCache
 from notifications_utils.template import (
     BaseBroadcastTemplate,
     BaseEmailTemplate,
@@ -18,6 +20,7 @@ from notifications_utils.template import (
     BroadcastMessageTemplate,
     BroadcastPreviewTemplate,
     EmailPreviewTemplate,
+    EmailRenderBundle,
     HTMLEmailTemplate,
     LetterImageTemplate,
     LetterPreviewTemplate,
@@ -28,6 +31,8 @@ from notifications_utils.template import (
     SMSPreviewTemplate,
     SubjectMixin,
     Template,
+    _RenderedForEachValue,
+    render_many,
 )
 
 
@@ -662,13 +667,10 @@ def test_stripping_of_unsupported_characters_in_email_templates():
 @pytest.mark.parametrize(
     "template_class, prefix, body, expected_call",
     [
-        (SMSMessageTemplate, "a", "b", (Markup("b"), "a")),
         (SMSPreviewTemplate, "a", "b", (Markup("b"), "a")),
         (BroadcastPreviewTemplate, "a", "b", (Markup("b"), "a")),
-        (SMSMessageTemplate, None, "b", (Markup("b"), None)),
         (SMSPreviewTemplate, None, "b", (Markup("b"), None)),
         (BroadcastPreviewTemplate, None, "b", (Markup("b"), None)),
-        (SMSMessageTemplate, "<em>ht&ml</em>", "b", (Markup("b"), "<em>ht&ml</em>")),
         (
             SMSPreviewTemplate,
             "<em>ht&ml</em>",
@@ -699,7 +701,6 @@ def test_sms_message_adds_prefix(
 @pytest.mark.parametrize(
     "template_class",
     [
-        SMSMessageTemplate,
         SMSPreviewTemplate,
         BroadcastPreviewTemplate,
     ],
@@ -731,6 +732,31 @@ def test_sms_message_adds_prefix_only_if_asked_to(
     add_prefix.assert_called_once_with(*expected_call)
 
 
+@mock.patch("notifications_utils.template.normalise_sms", return_value="")
+@pytest.mark.parametrize(
+    "show_prefix, prefix, expected_prefix",
+    [
+        (False, "a", None),
+        (True, "a", "a"),
+        (True, None, None),
+        (True, "<em>ht&ml</em>", "<em>ht&ml</em>"),
+    ],
+)
+def test_sms_message_template_normalises_with_prefix_only_if_asked_to(
+    normalise_sms,
+    show_prefix,
+    prefix,
+    expected_prefix,
+):
+    template = SMSMessageTemplate(
+        {"content": "b", "template_type": "sms"},
+        prefix=prefix,
+        show_prefix=show_prefix,
+    )
+    str(template)
+    normalise_sms.assert_called_once_with("b", expected_prefix)
+
+
 @pytest.mark.parametrize("content_to_look_for", ["GOVUK", "sms-message-sender"])
 @pytest.mark.parametrize(
     "show_sender",
@@ -1639,6 +1665,66 @@ def test_sms_fragment_count_accounts_for_non_latin_characters(
     assert template.fragment_count == expected_sms_fragment_count
 
 
+@pytest.mark.parametrize(
+    "content, prefix",
+    (
+        ("Hello ((name)), see you at ((place)).", None),
+        ("Hello  ((name)) ,\n\n\n\n((place))\u00A0 .", "Service"),
+        ("((name))((place))", "Service ."),
+        ("Hello ((name??Dear customer)) – ((place))…", None),
+        ("Cześć ((name)), ((place)) ŵ", None),
+        ("Hello ((name)) " * 30, None),
+    ),
+)
+@pytest.mark.parametrize(
+    "values",
+    (
+        {"name": "Jo", "place": "the clinic"},
+        {"name": "Jo Smith", "place": "Caffè Nero"},
+        {"name": "Jo", "place": ["one", "two"]},
+        {"name": "yes", "place": 1},
+        {"name": "Jo"},
+        {"name": " Jo", "place": "the\nclinic"},
+        {"name": "", "place": "."},
+        {"name": "Jo  Smith", "place": "a .b"},
+        {"name": "Jo\u200B", "place": "\u00A0"},
+        {"name": "Jo", "place": "ŵ" * 100},
+    ),
+)
+def test_sms_counts_match_rendered_message(content, prefix, values):
+    template = SMSMessageTemplate(
+        {"content": content, "template_type": "sms"}, values, prefix=prefix
+    )
+    rendered = SMSMessageTemplate(
+        {"content": content, "template_type": "sms"}, values, prefix=prefix
+    )
+    rendered._count_without_rendering = lambda: None
+
+    assert template.content_count == rendered.content_count
+    assert template.fragment_count == rendered.fragment_count
+    assert template.is_message_too_long() == rendered.is_message_too_long()
+
+
+def test_sms_counts_dont_render_message_for_simple_values(mocker):
+    template = SMSMessageTemplate(
+        {"content": "Hello ((name)), see you at ((place)).", "template_type": "sms"},
+        {"name": "Jo", "place": "the clinic"},
+        prefix="Service",
+    )
+    mock_render = mocker.patch.object(
+        SMSMessageTemplate, "_get_unsanitised_content", return_value=""
+    )
+
+    assert template.content_count == len("Service: Hello Jo, see you at the clinic.")
+    assert template.fragment_count == 1
+    assert mock_render.called is False
+
+    template.values = {"name": "Jo\nSmith", "place": "the clinic"}
+
+    assert template.content_count == 0
+    assert mock_render.call_count == 1
+
+
 @pytest.mark.parametrize(
     "template_class",
     [
@@ -2098,12 +2184,11 @@ def test_templates_handle_html_and_redacting(
             ],
         ),
         (
+            # Uses normalise_sms, which does this itself
             SMSMessageTemplate,
             "sms",
             {},
-            [
-                mock.call("content"),
-            ],
+            [],
         ),
         (
             SMSPreviewTemplate,
@@ -3386,3 +3471,447 @@ def test_broadcast_message_single_counts_diacritics_in_gsm(
     )
     assert template.encoded_content_count == 1
     assert template.max_content_count == 1_395
+
+
+@pytest.mark.parametrize(
+    "template_dict, template_class, kwargs",
+    [
+        (
+            {"template_type": "sms", "content": "Hi ((name)), ((place??see you)) -- ."},
+            None,
+            {"prefix": "Service"},
+        ),
+        (
+            {
+                "template_type": "email",
+                "subject": "Hello ((name))",
+                "content": "Dear ((name)),\n\n* ((place))\n\n^ ((place??Extra))",
+            },
+            None,
+            {},
+        ),
+        (
+            {
+                "template_type": "email",
+                "subject": "Your appointment",
+                "content": "Dear ((name)),\n\n* ((place))",
+            },
+            HTMLEmailTemplate,
+            {
+                "govuk_banner": False,
+                "complete_html": False,
+                "brand_logo": "https://example.com/logo.png",
+                "brand_text": "Example",
+                "brand_colour": "#f00",
+                "brand_banner": True,
+                "brand_name": "Example",
+            },
+        ),
+        (
+            {
+                "template_type": "email",
+                "subject": "Hello ((name))",
+                "content": "Dear ((name)), ((place))",
+            },
+            PlainTextEmailTemplate,
+            {},
+        ),
+    ],
+)
+def test_render_many_matches_rendering_each_template(
+    template_dict, template_class, kwargs
+):
+    personalisations = [
+        {"name": "Jo", "place": "Clinic"},
+        {"name": "<b>Sam</b>", "place": ["one", "two"]},
+        {"name": "Jo", "place": "Clinic"},
+        {"name": 1, "place": None},
+        {"name": True, "place": "no"},
+        {"name": "O’Neil", "place": "https://example.com", "other": "ignored"},
+        {},
+    ]
+    expected_class = (
+        template_class
+        or {
+            "sms": SMSMessageTemplate,
+            "email": HTMLEmailTemplate,
+        }[template_dict["template_type"]]
+    )
+
+    assert list(
+        render_many(
+            template_dict, personalisations, template_class=template_class, **kwargs
+        )
+    ) == [
+        str(expected_class(template_dict, personalisation, **kwargs))
+        for personalisation in personalisations
+    ]
+
+
+def test_render_many_only_renders_each_part_once_per_distinct_value(mocker):
+    template = HTMLEmailTemplate(
+        {
+            "template_type": "email",
+            "subject": "Your appointment",
+            "content": "Dear ((name))",
+        },
+        {"name": "Original"},
+    )
+    jinja_render = mocker.spy(template.jinja_template, "render")
+    notify_email_markdown = mocker.patch(
+        "notifications_utils.template.notify_email_markdown", side_effect=lambda x: x
+    )
+
+    rendered = list(
+        template.render_each([{"name": "Jo"}, {"name": "Sam"}, {"name": "Jo"}])
+    )
+
+    assert "Dear Jo" in rendered[0]
+    assert "Dear Sam" in rendered[1]
+    assert rendered[2] == rendered[0]
+    assert jinja_render.call_count == 1
+    assert notify_email_markdown.call_count == 2
+    assert template.values == {"name": "Original"}
+
+
+@pytest.mark.parametrize(
+    "names, expected_renders, still_remembering",
+    (
+        ([f"Name {index}" for index in range(200)], 200, False),
+        (["Jo", "Sam"] * 100, 2, True),
+    ),
+)
+def test_render_many_only_remembers_values_if_they_repeat(
+    names, expected_renders, still_remembering
+):
+    template = SMSMessageTemplate({"template_type": "sms", "content": "Hi ((name))"})
+    render = mock.Mock(side_effect=lambda: f"Hi {template.values['name']}")
+    rendered_for_each_value = _RenderedForEachValue(
+        template, template.placeholders, render
+    )
+
+    for name in names:
+        template.values = {"name": name}
+        assert rendered_for_each_value() == f"Hi {name}"
+
+    assert render.call_count == expected_renders
+    assert (rendered_for_each_value.rendered is not None) is still_remembering
+
+
+@pytest.mark.parametrize(
+    "template_class, template_type, extra_args, personalisations",
+    (
+        (
+            SMSPreviewTemplate,
+            "sms",
+            {"show_recipient": True},
+            [
+                {"name": "Jo", "phone number": "07700900001"},
+                {"name": "Jo", "phone number": "07700900002"},
+            ],
+        ),
+        (
+            EmailPreviewTemplate,
+            "email",
+            {},
+            [
+                {"name": "Jo", "email address": "jo@example.com"},
+                {"name": "Jo", "email address": "jo.bloggs@example.com"},
+            ],
+        ),
+        (
+            LetterPreviewTemplate,
+            "letter",
+            {"date": datetime(2020, 1, 1, 12)},
+            [
+                {
+                    "name": "Jo",
+                    "address line 1": "Jo Bloggs",
+                    "address line 2": "1 Example Street",
+                    "postcode": "SW1A 1AA",
+                },
+                {
+                    "name": "Jo",
+                    "address line 1": "Jo Bloggs",
+                    "address line 2": "2 Example Street",
+                    "postcode": "SW1A 1AA",
+                },
+                {
+                    "name": "Jo",
+                    "address line 1": "Jo Bloggs",
+                    "address line 2": "2 Example Street",
+                    "postcode": "SW1A 1AA",
+                    "address line 7": "SW1A 2AA",
+                },
+            ],
+        ),
+    ),
+)
+def test_render_each_renders_again_for_a_different_recipient(
+    template_class, template_type, extra_args, personalisations
+):
+    template_dict = {
+        "template_type": template_type,
+        "subject": "Hello",
+        "content": "Dear ((name))",
+    }
+
+    rendered = list(
+        render_many(
+            template_dict,
+            personalisations,
+            template_class=template_class,
+            **extra_args,
+        )
+    )
+
+    assert rendered == [
+        str(template_class(template_dict, values, **extra_args))
+        for values in personalisations
+    ]
+    assert len(set(rendered)) == len(personalisations)
+
+
+@pytest.mark.parametrize(
+    "template_class, template_type, extra_args",
+    (
+        (EmailPreviewTemplate, "email", {}),
+        (SMSPreviewTemplate, "sms", {}),
+        (BroadcastPreviewTemplate, "broadcast", {}),
+        (LetterPreviewTemplate, "letter", {"date": datetime(2020, 1, 1, 12)}),
+    ),
+)
+def test_preview_templates_use_render_cache(template_class, template_type, extra_args):
+    template_dict = {
+        "template_type": template_type,
+        "subject": "Hello ((name))",
+        "content": "Dear ((name)), see you at ((place))",
+    }
+    cache = LRURenderCache()
+
+    def render(values, **kwargs):
+        template = template_class(template_dict, values, **extra_args, **kwargs)
+        template.render_cache = cache
+        return str(template)
+
+    first = render({"name": "Jo", "place": "the clinic"})
+    second = render({"name": "Jo", "place": "the clinic"})
+
+    assert (
+        first
+        == second
+        == str(
+            template_class(
+                template_dict, {"name": "Jo", "place": "the clinic"}, **extra_args
+            )
+        )
+    )
+    assert isinstance(second, Markup)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert "Sam" in render({"name": "Sam", "place": "the clinic"})
+    assert render({"name": "Jo", "place": ["one", "two"]}) != first
+    assert (
+        render(
+            {"name": "Jo", "place": "the clinic"}, redact_missing_personalisation=True
+        )
+        == first
+    )
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+@pytest.mark.parametrize(
+    "template_class, template_dict, options",
+    (
+        (
+            EmailPreviewTemplate,
+            {"template_type": "email", "subject": "Hi", "content": "Hello"},
+            (
+                {"from_name": "Example"},
+                {"from_address": "test@example.com"},
+                {"reply_to": "reply@example.com"},
+                {"show_recipient": False},
+                {"redact_missing_personalisation": True},
+            ),
+        ),
+        (
+            SMSPreviewTemplate,
+            {"template_type": "sms", "content": "Hello"},
+            (
+                {"prefix": "Service"},
+                {"sender": "12345"},
+                {"show_recipient": True},
+                {"show_sender": True},
+                {"downgrade_non_sms_characters": False},
+                {"redact_missing_personalisation": True},
+            ),
+        ),
+        (
+            LetterPreviewTemplate,
+            {"template_type": "letter", "subject": "Hi", "content": "Hello"},
+            (
+                {"contact_block": "Example"},
+                {"admin_base_url": "https://example.com"},
+                {"logo_file_name": "example.png"},
+                {"redact_missing_personalisation": True},
+                {"date": datetime(2021, 1, 1)},
+            ),
+        ),
+    ),
+)
+def test_render_cache_key_depends_on_template_and_options(
+    template_class, template_dict, options
+):
+    def key(template_dict, **kwargs):
+        return template_class(template_dict, **kwargs).render_cache_key
+
+    default_key = key(template_dict)
+    keys = {default_key}
+    for option in options:
+        keys.add(key(template_dict, **option))
+    keys.add(key(template_dict | {"content": "Goodbye"}))
+    if "subject" in template_dict:
+        keys.add(key(template_dict | {"subject": "Bye"}))
+
+    assert len(keys) == len(options) + 2 + ("subject" in template_dict)
+    assert key(template_dict) == default_key
+    assert key(template_dict | {"id": "1234", "name": "Renamed"}) == default_key
+
+
+def test_render_cache_key_distinguishes_values_which_render_differently():
+    template_dict = {"template_type": "sms", "content": "((name))"}
+    keys = {
+        SMSPreviewTemplate(template_dict, values).render_cache_key
+        for values in (
+            {"name": 1},
+            {"name": True},
+            {"name": "1"},
+            {"name": "True"},
+            {"name": None},
+            {"name": ["1"]},
+            {"name": "1", "other": "x"},
+        )
+    }
+    assert len(keys) == 7
+
+
+def test_letter_preview_render_cache_key_only_depends_on_the_day():
+    template_dict = {"template_type": "letter", "subject": "Hi", "content": "Hello"}
+    assert (
+        LetterPreviewTemplate(
+            template_dict, date=datetime(2021, 1, 1, 9)
+        ).render_cache_key
+        == LetterPreviewTemplate(
+            template_dict, date=datetime(2021, 1, 1, 17)
+        ).render_cache_key
+    )
+
+
+def test_render_cache_can_be_set_for_a_whole_template_class(mocker):
+    cache = LRURenderCache()
+    mocker.patch.object(SMSPreviewTemplate, "render_cache", cache)
+    jinja_render = mocker.spy(SMSPreviewTemplate.jinja_template, "render")
+    template_dict = {"template_type": "sms", "content": "Hello ((name))"}
+
+    for _ in range(3):
+        str(SMSPreviewTemplate(template_dict, {"name": "Jo"}))
+    str(SMSMessageTemplate(template_dict, {"name": "Jo"}))
+
+    assert jinja_render.call_count == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    "template_dict, values",
+    (
+        (
+            {
+                "template_type": "email",
+                "subject": "Your ((thing))",
+                "content": "# Hello ((name))\n\n* one\n* two\n\nSee https://gov.uk",
+            },
+            {"name": "Jo", "thing": "appointment"},
+        ),
+        (
+            {
+                "template_type": "email",
+                "subject": "‘Quotes’ & <tags>",
+                "content": "Dear ((name)),\n\n^ ((inset))\n\nGOV.UK &amp; ((list))",
+            },
+            {"name": "<b>Sam</b>", "inset": "a -- b", "list": ["one", "two"]},
+        ),
+        (
+            {"template_type": "email", "subject": "Hi", "content": "((missing))"},
+            {},
+        ),
+    ),
+)
+def test_email_render_bundle_matches_rendering_each_part(template_dict, values):
+    html_template = HTMLEmailTemplate(template_dict, values, brand_name="Example")
+    plain_text_template = PlainTextEmailTemplate(template_dict, values)
+
+    assert html_template.render_bundle() == EmailRenderBundle(
+        subject=plain_text_template.subject,
+        html=str(html_template),
+        plain_text=str(plain_text_template),
+        preheader=html_template.preheader,
+        content_size_in_bytes=html_template.content_size_in_bytes,
+    )
+
+
+def test_letter_values_are_bound_to_placeholders_in_new_contact_block():
+    template = LetterPreviewTemplate(
+        {"template_type": "letter", "subject": "Hi", "content": "Hello ((name))"},
+        {"name": "Jo"},
+    )
+    template.contact_block = "((Org Name))"
+    template.values = {"name": "Jo"}
+
+    assert template.values == {"name": "Jo", "Org Name": None}
+
+
+def test_email_render_bundle_is_remembered_until_values_change(mocker):
+    template = HTMLEmailTemplate(
+        {"template_type": "email", "subject": "Hi", "content": "Hello ((name))"},
+        {"name": "Jo"},
+    )
+    notify_email_markdown = mocker.patch(
+        "notifications_utils.template.notify_email_markdown", side_effect=lambda x: x
+    )
+
+    bundle = template.render_bundle()
+
+    assert template.render_bundle() is bundle
+    assert notify_email_markdown.call_count == 1
+
+    template.values = {"name": "Sam"}
+
+    assert "Hello Sam" in template.render_bundle().plain_text
+    assert notify_email_markdown.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "change, expected_in_bundle",
+    (
+        (lambda template: setattr(template, "content", "Bye ((name))"), "Bye Jo"),
+        (lambda template: setattr(template, "_subject", "New subject"), "New subject"),
+        (lambda template: template.values.update(name="Sam"), "Hello Sam"),
+        (lambda template: setattr(template, "brand_text", "Acme"), "Acme"),
+    ),
+)
+def test_email_render_bundle_is_rendered_again_when_template_changes(
+    change, expected_in_bundle
+):
+    template = HTMLEmailTemplate(
+        {"template_type": "email", "subject": "Hi", "content": "Hello ((name))"},
+        {"name": "Jo"},
+        brand_banner=True,
+        brand_logo="https://example.com/logo.png",
+    )
+    bundle = template.render_bundle()
+
+    change(template)
+
+    assert template.render_bundle() != bundle
+    assert expected_in_bundle in template.render_bundle().html
+    assert template.render_bundle().html == str(template)